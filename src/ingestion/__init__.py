@@ -32,7 +32,12 @@ from .article_downloader import (
 )
 
 # Content loaders
-from .pdf_loader import load_pdf_source, load_pdf_from_file
+from .pdf_loader import (
+    load_pdf_source,
+    load_pdf_from_file,
+    load_pdf_from_bytes,
+    clear_pdf_cache
+)
 from .article_loader import load_article
 from .text_loader import load_text_file
 from .yt_bot import load_youtube_video
@@ -71,6 +76,8 @@ __all__ = [
     # Content loaders
     "load_pdf_source",
     "load_pdf_from_file",
+    "load_pdf_from_bytes",
+    "clear_pdf_cache",
     "load_article",
     "load_text_file",
     "load_youtube_video",
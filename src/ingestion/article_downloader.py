@@ -31,6 +31,12 @@ def sanitize_filename(filename: str, max_length: int = 200) -> str:
 
     Returns:
         Sanitized filename safe for filesystem
+
+    Example:
+        >>> sanitize_filename("Title: With Special/Characters")
+        'Title_ With Special_Characters'
+        >>> len(sanitize_filename("a" * 300))
+        200
     """
     # Remove or replace invalid characters
     filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
@@ -78,6 +84,12 @@ def is_downloadable_article(url: str) -> bool:
 
     Returns:
         True if URL appears to be a downloadable document
+
+    Example:
+        >>> is_downloadable_article("https://arxiv.org/pdf/2101.12345.pdf")
+        True
+        >>> is_downloadable_article("https://youtube.com/watch?v=test")
+        False
     """
     url_lower = url.lower()
 
@@ -5,11 +5,14 @@ This module provides functions to download and extract text from PDF files
 using PyMuPDF for better structure preservation, with pypdf as fallback.
 """
 
+import functools
+import io
 import os
 import tempfile
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 import requests
+from requests.adapters import HTTPAdapter
 import fitz  # PyMuPDF
 from pypdf import PdfReader
 from langchain_core.documents import Document
@@ -18,6 +21,25 @@ from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Maximum number of parsed PDFs kept by load_pdf_from_file
+PDF_CACHE_SIZE = 128
+
+# Plain-text extraction flags: exactly PyMuPDF's default for get_text("text")
+# (ligatures, whitespace, mediabox clipping, CID fallback for unmapped glyphs),
+# passed explicitly only so the extraction mode is visible at the call site
+TEXT_EXTRACTION_FLAGS = fitz.TEXTFLAGS_TEXT
+
+# Streaming chunk size for PDF downloads
+DOWNLOAD_CHUNK_SIZE = 65536
+
+# Shared HTTP session so repeated downloads reuse pooled connections
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+})
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 def download_pdf(url: str, output_path: Optional[str] = None, timeout: int = 30) -> str:
     """
@@ -37,26 +59,25 @@ def download_pdf(url: str, output_path: Optional[str] = None, timeout: int = 30)
     logger.info(f"Downloading PDF from: {url}")
 
     try:
-        # Set user agent to avoid blocking
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-
-        # Download with streaming
-        response = requests.get(url, headers=headers, timeout=timeout, stream=True)
-        response.raise_for_status()
-
-        # Determine output path
-        if output_path is None:
-            # Create temp file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            output_path = temp_file.name
-            temp_file.close()
-
-        # Save to file
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Download with streaming over the pooled session
+        response = _SESSION.get(url, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+
+            # Determine output path
+            if output_path is None:
+                # Create temp file
+                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
+                output_path = temp_file.name
+                temp_file.close()
+
+            # Save to file
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        finally:
+            # Release the connection back to the pool
+            response.close()
 
         file_size = os.path.getsize(output_path)
         logger.info(f"Downloaded PDF: {file_size / 1024:.1f} KB -> {output_path}")
@@ -68,12 +89,57 @@ def download_pdf(url: str, output_path: Optional[str] = None, timeout: int = 30)
         raise
 
 
-def extract_text_from_pdf_pymupdf(pdf_path: str) -> tuple[str, Dict[str, Any]]:
+def fetch_pdf_bytes(url: str, timeout: int = 30) -> bytes:
+    """
+    Download PDF from URL into memory.
+
+    Args:
+        url: URL of PDF file
+        timeout: Request timeout in seconds
+
+    Returns:
+        Raw PDF bytes
+
+    Raises:
+        requests.RequestException: If download fails
+    """
+    logger.info(f"Fetching PDF from: {url}")
+
+    try:
+        response = _SESSION.get(url, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+
+            buffer = io.BytesIO()
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+        finally:
+            # Release the connection back to the pool
+            response.close()
+
+        data = buffer.getvalue()
+        logger.info(f"Fetched PDF: {len(data) / 1024:.1f} KB")
+
+        return data
+
+    except Exception as e:
+        logger.error(f"Failed to fetch PDF from {url}: {str(e)}")
+        raise
+
+
+def _describe_pdf(pdf_source: Union[str, bytes]) -> str:
+    """Return a log-friendly label for a PDF path or in-memory PDF."""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return f"<{len(pdf_source)} bytes in memory>"
+    return str(pdf_source)
+
+
+def extract_text_from_pdf_pymupdf(pdf_path: Union[str, bytes]) -> tuple[str, Dict[str, Any]]:
     """
     Extract text from PDF using PyMuPDF (better structure preservation).
 
     Args:
-        pdf_path: Path to PDF file
+        pdf_path: Path to PDF file, or the raw PDF bytes
 
     Returns:
         Tuple of (extracted_text, metadata_dict)
@@ -81,10 +147,14 @@ def extract_text_from_pdf_pymupdf(pdf_path: str) -> tuple[str, Dict[str, Any]]:
     Raises:
         Exception: If extraction fails
     """
-    logger.info(f"Extracting text from PDF with PyMuPDF: {pdf_path}")
+    logger.info(f"Extracting text from PDF with PyMuPDF: {_describe_pdf(pdf_path)}")
 
     try:
-        doc = fitz.open(pdf_path)
+        if isinstance(pdf_path, (bytes, bytearray)):
+            # Parse straight from memory, no temp file needed
+            doc = fitz.open(stream=pdf_path, filetype="pdf")
+        else:
+            doc = fitz.open(pdf_path)
 
         text_parts = []
         metadata = {
@@ -94,18 +164,17 @@ def extract_text_from_pdf_pymupdf(pdf_path: str) -> tuple[str, Dict[str, Any]]:
             "subject": doc.metadata.get("subject", ""),
         }
 
-        for page_num in range(len(doc)):
+        # Iterate pages directly and join once at the end (linear in page count)
+        for page_num, page in enumerate(doc, 1):
             try:
-                page = doc[page_num]
-
                 # Extract text with better formatting
-                page_text = page.get_text("text")
+                page_text = page.get_text("text", flags=TEXT_EXTRACTION_FLAGS)
 
                 if page_text.strip():
-                    text_parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+                    text_parts.append(f"\n--- Page {page_num} ---\n{page_text}")
 
             except Exception as e:
-                logger.warning(f"Failed to extract page {page_num + 1}: {str(e)}")
+                logger.warning(f"Failed to extract page {page_num}: {str(e)}")
                 continue
 
         doc.close()
@@ -127,20 +196,23 @@ def extract_text_from_pdf_pymupdf(pdf_path: str) -> tuple[str, Dict[str, Any]]:
         raise
 
 
-def extract_text_from_pdf_fallback(pdf_path: str) -> tuple[str, Dict[str, Any]]:
+def extract_text_from_pdf_fallback(pdf_path: Union[str, bytes]) -> tuple[str, Dict[str, Any]]:
     """
     Fallback PDF extraction using pypdf.
 
     Args:
-        pdf_path: Path to PDF file
+        pdf_path: Path to PDF file, or the raw PDF bytes
 
     Returns:
         Tuple of (extracted_text, metadata_dict)
     """
-    logger.info(f"Using fallback pypdf extractor for: {pdf_path}")
+    logger.info(f"Using fallback pypdf extractor for: {_describe_pdf(pdf_path)}")
 
     try:
-        reader = PdfReader(pdf_path)
+        if isinstance(pdf_path, (bytes, bytearray)):
+            reader = PdfReader(io.BytesIO(pdf_path))
+        else:
+            reader = PdfReader(pdf_path)
 
         text = ""
         for page_num, page in enumerate(reader.pages, 1):
@@ -223,9 +295,53 @@ def clean_pdf_text(text: str) -> str:
     return text.strip()
 
 
-def load_pdf_from_file(file_path: str, source_url: Optional[str] = None) -> Document:
+def _build_pdf_document(
+    pdf_source: Union[str, bytes],
+    source: str,
+    file_path: str
+) -> Document:
     """
-    Load PDF from local file as a LangChain Document.
+    Extract text from a PDF path or bytes and wrap it in a Document.
+
+    Args:
+        pdf_source: Path to PDF file, or the raw PDF bytes
+        source: Value for the document's "source" metadata
+        file_path: Value for the document's "file_path" metadata
+
+    Returns:
+        LangChain Document with extracted text and metadata
+
+    Raises:
+        ValueError: If no text could be extracted
+    """
+    # Extract text with metadata
+    text, pdf_metadata = extract_text_from_pdf_pymupdf(pdf_source)
+
+    if not text:
+        # Try fallback
+        text, pdf_metadata = extract_text_from_pdf_fallback(pdf_source)
+
+    if not text:
+        raise ValueError(f"No text extracted from PDF: {source}")
+
+    # Create Document with metadata
+    return Document(
+        page_content=text,
+        metadata={
+            "source": source,
+            "source_type": "pdf",
+            "content_length": len(text),
+            "file_path": file_path,
+            "num_pages": pdf_metadata.get("num_pages", 0),
+            "title": pdf_metadata.get("title", ""),
+            "author": pdf_metadata.get("author", ""),
+        }
+    )
+
+
+def _load_pdf_from_file(file_path: str, source_url: Optional[str] = None) -> Document:
+    """
+    Load PDF from local file as a LangChain Document (uncached).
 
     Args:
         file_path: Path to local PDF file
@@ -236,39 +352,15 @@ def load_pdf_from_file(file_path: str, source_url: Optional[str] = None) -> Docu
 
     Raises:
         Exception: If extraction fails
-
-    Example:
-        >>> doc = load_pdf_from_file("/path/to/paper.pdf")
-        >>> print(f"Loaded {len(doc.page_content)} characters")
     """
     logger.info(f"Loading PDF from file: {file_path}")
 
     try:
-        # Extract text with metadata
-        text, pdf_metadata = extract_text_from_pdf_pymupdf(file_path)
-
-        if not text:
-            # Try fallback
-            text, pdf_metadata = extract_text_from_pdf_fallback(file_path)
-
-        if not text:
-            raise ValueError(f"No text extracted from PDF: {file_path}")
-
-        # Create Document with metadata
-        doc = Document(
-            page_content=text,
-            metadata={
-                "source": source_url or file_path,
-                "source_type": "pdf",
-                "content_length": len(text),
-                "file_path": file_path,
-                "num_pages": pdf_metadata.get("num_pages", 0),
-                "title": pdf_metadata.get("title", ""),
-                "author": pdf_metadata.get("author", ""),
-            }
-        )
+        doc = _build_pdf_document(file_path, source_url or file_path, file_path)
 
-        logger.info(f"Successfully loaded PDF: {len(text)} characters from {file_path}")
+        logger.info(
+            f"Successfully loaded PDF: {len(doc.page_content)} characters from {file_path}"
+        )
 
         return doc
 
@@ -277,15 +369,102 @@ def load_pdf_from_file(file_path: str, source_url: Optional[str] = None) -> Docu
         raise
 
 
+def load_pdf_from_bytes(data: bytes, source_url: str) -> Document:
+    """
+    Load an in-memory PDF as a LangChain Document.
+
+    Args:
+        data: Raw PDF bytes
+        source_url: Original URL of the PDF
+
+    Returns:
+        LangChain Document with extracted text and metadata ("file_path" is empty)
+
+    Raises:
+        Exception: If extraction fails
+    """
+    logger.info(f"Loading PDF from memory: {source_url}")
+
+    try:
+        doc = _build_pdf_document(data, source_url, "")
+
+        logger.info(
+            f"Successfully loaded PDF: {len(doc.page_content)} characters from {source_url}"
+        )
+
+        return doc
+
+    except Exception as e:
+        logger.error(f"Failed to load PDF from {source_url}: {str(e)}")
+        raise
+
+
+@functools.lru_cache(maxsize=PDF_CACHE_SIZE)
+def _load_pdf_cached(
+    file_path: str,
+    source_url: Optional[str],
+    mtime_ns: int,
+    size: int
+) -> Document:
+    """Cache parsed PDFs keyed by path plus modification time and size."""
+    return _load_pdf_from_file(file_path, source_url=source_url)
+
+
+def clear_pdf_cache() -> None:
+    """
+    Drop every parsed PDF cached by load_pdf_from_file.
+
+    The cache holds up to PDF_CACHE_SIZE full document texts for the life of
+    the process; call this to free that memory or to force re-parsing.
+    """
+    _load_pdf_cached.cache_clear()
+
+
+def load_pdf_from_file(file_path: str, source_url: Optional[str] = None) -> Document:
+    """
+    Load PDF from local file as a LangChain Document.
+
+    Parsed results are cached per (path, mtime, size), so repeated loads of an
+    unchanged file skip re-parsing. Files that cannot be stat'ed are not cached.
+
+    Args:
+        file_path: Path to local PDF file
+        source_url: Optional original URL of the PDF
+
+    Returns:
+        LangChain Document with extracted text and metadata
+
+    Raises:
+        Exception: If extraction fails
+
+    Example:
+        >>> doc = load_pdf_from_file("/path/to/paper.pdf")
+        >>> print(f"Loaded {len(doc.page_content)} characters")
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return _load_pdf_from_file(file_path, source_url=source_url)
+
+    doc = _load_pdf_cached(file_path, source_url, stat.st_mtime_ns, stat.st_size)
+
+    # Return a copy so callers can't mutate the cached Document
+    return Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+
+
 def load_pdf_source(url: str, cleanup: bool = True) -> Document:
     """
     Load PDF from URL as a LangChain Document.
 
     This is the main function to use for loading PDFs into the RAG system.
 
+    The PDF is downloaded into memory and parsed from there; nothing is
+    written to disk.
+
     Args:
         url: URL of PDF file
-        cleanup: Whether to delete temporary file after extraction
+        cleanup: Unused; kept for backward compatibility (no temporary file is
+            written anymore)
 
     Returns:
         LangChain Document with extracted text and metadata
@@ -300,25 +479,12 @@ def load_pdf_source(url: str, cleanup: bool = True) -> Document:
     """
     logger.info(f"Loading PDF source: {url}")
 
-    pdf_path = None
     try:
-        # Download PDF
-        pdf_path = download_pdf(url)
+        # Download PDF into memory and parse it from there
+        data = fetch_pdf_bytes(url)
 
-        # Load from downloaded file
-        doc = load_pdf_from_file(pdf_path, source_url=url)
-
-        return doc
+        return load_pdf_from_bytes(data, source_url=url)
 
     except Exception as e:
         logger.error(f"Failed to load PDF source {url}: {str(e)}")
         raise
-
-    finally:
-        # Cleanup temp file if requested
-        if cleanup and pdf_path and os.path.exists(pdf_path):
-            try:
-                os.unlink(pdf_path)
-                logger.debug(f"Cleaned up temporary file: {pdf_path}")
-            except:
-                pass
@@ -14,6 +14,13 @@ from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Supported YouTube URL formats, compiled once at import
+_VIDEO_ID_PATTERNS = [
+    re.compile(r'youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})'),  # Standard format
+    re.compile(r'youtu\.be/([a-zA-Z0-9_-]{11})'),              # Short format
+    re.compile(r'youtube\.com/embed/([a-zA-Z0-9_-]{11})'),     # Embed format
+]
+
 def get_video_id(url: str) -> Optional[str]:
     """
     Extract video ID from YouTube URL.
@@ -28,15 +35,8 @@ def get_video_id(url: str) -> Optional[str]:
         >>> get_video_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
         'dQw4w9WgXcQ'
     """
-    # Support multiple YouTube URL formats
-    patterns = [
-        r'youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})',  # Standard format
-        r'youtu\.be/([a-zA-Z0-9_-]{11})',              # Short format
-        r'youtube\.com/embed/([a-zA-Z0-9_-]{11})',     # Embed format
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
 
@@ -92,6 +92,27 @@ def get_transcript(url: str) -> Optional[list]:
         logger.error(f"Error fetching transcript for {video_id}: {str(e)}")
         raise
 
+def _fmt_timestamp(start: float) -> str:
+    """Format a start offset in seconds as MM:SS."""
+    return f"{int(start // 60):02d}:{int(start % 60):02d}"
+
+
+def _format_segment(segment) -> Optional[str]:
+    """
+    Format one transcript segment as "[MM:SS] text".
+
+    Returns:
+        Formatted line, or None if the segment is malformed
+    """
+    try:
+        # Access dictionary keys (not attributes)
+        return f"[{_fmt_timestamp(segment['start'])}] {segment['text']}"
+    except (KeyError, TypeError) as e:
+        # If there is an issue accessing keys, skip this entry
+        logger.warning(f"Skipping malformed transcript segment: {e}")
+        return None
+
+
 def process(transcript: list) -> str:
     """
     Process transcript segments into a formatted string.
@@ -105,30 +126,10 @@ def process(transcript: list) -> str:
     if not transcript:
         return ""
 
-    # Initialize an empty string to hold the formatted transcript
-    txt = ""
-
-    # Loop through each entry in the transcript
-    for segment in transcript:
-        try:
-            # Access dictionary keys (not attributes)
-            text = segment['text']
-            start = segment['start']
-
-            # Format timestamp as MM:SS
-            minutes = int(start // 60)
-            seconds = int(start % 60)
-            timestamp = f"{minutes:02d}:{seconds:02d}"
-
-            # Append the text and its start time to the output string
-            txt += f"[{timestamp}] {text}\n"
-
-        except (KeyError, TypeError) as e:
-            # If there is an issue accessing keys, skip this entry
-            logger.warning(f"Skipping malformed transcript segment: {e}")
-            continue
+    # Format every segment and join once (linear in transcript length)
+    lines = (_format_segment(segment) for segment in transcript)
 
-    return txt.strip()
+    return "\n".join(line for line in lines if line is not None).strip()
 
 
 def load_youtube_video(url: str) -> Document:
@@ -17,6 +17,9 @@ from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Pass as log_file to keep the cost log in memory instead of on disk
+IN_MEMORY_LOG = ":memory:"
+
 
 @dataclass
 class APICall:
@@ -44,15 +47,21 @@ class CostTracker:
         Initialize cost tracker.
 
         Args:
-            log_file: Path to cost log file (default: from config)
+            log_file: Path to cost log file (default: from config), or
+                ":memory:" to keep the log in memory without touching disk
         """
         self.config = get_config()
+        self.in_memory = log_file == IN_MEMORY_LOG
         self.log_file = Path(
             log_file or self.config.paths.cost_log_file
         )
 
+        # In-memory log (used instead of the log file when in_memory is set)
+        self._memory_logs: List[Dict] = []
+
         # Ensure directory exists
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        if not self.in_memory:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Session tracking
         self.session_calls: List[APICall] = []
@@ -221,6 +230,10 @@ class CostTracker:
             # Add to session
             self.session_calls.append(api_call)
 
+            if self.in_memory:
+                self._memory_logs.append(api_call.to_dict())
+                return
+
             # Append to log file
             try:
                 # Load existing logs
@@ -292,7 +305,7 @@ class CostTracker:
         Returns:
             Dictionary with cost breakdown
         """
-        if not self.log_file.exists():
+        if not self.in_memory and not self.log_file.exists():
             return {
                 "total": 0.0,
                 "by_provider": {},
@@ -302,8 +315,11 @@ class CostTracker:
             }
 
         try:
-            with open(self.log_file, 'r') as f:
-                logs = json.load(f)
+            if self.in_memory:
+                logs = list(self._memory_logs)
+            else:
+                with open(self.log_file, 'r') as f:
+                    logs = json.load(f)
 
             # Filter by date range if specified
             if start_date or end_date:
@@ -357,6 +373,17 @@ class CostTracker:
         self.session_start_time = datetime.now()
         logger.debug("Cost tracker session reset")
 
+    def reset(self) -> None:
+        """
+        Reset the session and, for a ":memory:" log, discard every logged call.
+
+        A log file on disk is left untouched; only reset_session() applies.
+        """
+        with self._lock:
+            self.reset_session()
+            if self.in_memory:
+                self._memory_logs.clear()
+
     def get_session_summary(self) -> str:
         """
         Get formatted summary of session costs.
@@ -9,16 +9,29 @@ from .embeddings import (
     OpenAIEmbedding
 )
 from .chroma_store import ChromaVectorStore
-from .parallel_embedding import (
-    parallel_chunk_documents,
-    parallel_embed_documents,
-    shutdown_ray
+from .memory_index import InMemoryIndex
+
+# Ray-based helpers are imported on first access so importing the package
+# does not pull in ray
+_PARALLEL_EXPORTS = (
+    "parallel_chunk_documents",
+    "parallel_embed_documents",
+    "shutdown_ray",
 )
 
+
+def __getattr__(name):
+    if name in _PARALLEL_EXPORTS:
+        from . import parallel_embedding
+        return getattr(parallel_embedding, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "EmbeddingModel",
     "OpenAIEmbedding",
     "ChromaVectorStore",
+    "InMemoryIndex",
     "parallel_chunk_documents",
     "parallel_embed_documents",
     "shutdown_ray",
@@ -5,17 +5,51 @@ This module provides a wrapper around ChromaDB for storing and retrieving
 document embeddings.
 """
 
-from typing import List, Tuple, Optional, Dict
+import hashlib
+import heapq
+import threading
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Literal, Tuple, Optional, Dict
 from pathlib import Path
-import chromadb
-from chromadb.config import Settings
+import numpy as np
 from langchain_core.documents import Document
 
 from src.vectorstore.embeddings import EmbeddingModel
+from src.vectorstore.memory_index import InMemoryIndex
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Number of chunks embedded and written to ChromaDB per add() call
+DEFAULT_BATCH_SIZE = 100
+
+# Number of batches embedded concurrently while earlier batches are written
+DEFAULT_EMBED_WORKERS = 8
+
+
+def _shard_for(doc_id: str, num_shards: int) -> int:
+    """Map a document ID to a shard index, stable across processes (unlike hash())."""
+    return int(hashlib.md5(doc_id.encode("utf-8")).hexdigest(), 16) % num_shards
+
+
+def _sanitize_metadata(metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Make a metadata dict acceptable to ChromaDB.
+
+    ChromaDB rejects None values and empty metadata dicts, so None values are
+    dropped and metadata left empty becomes None. Every other value is passed
+    through unchanged.
+
+    Args:
+        metadata: Document metadata
+
+    Returns:
+        New dict without None values, or None if no values remain
+    """
+    return {key: value for key, value in metadata.items() if value is not None} or None
+
 
 class ChromaVectorStore:
     """ChromaDB vector store for RAG system."""
@@ -24,7 +58,11 @@ class ChromaVectorStore:
         self,
         persist_directory: str,
         collection_name: str,
-        embedding_model: EmbeddingModel
+        embedding_model: EmbeddingModel,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        backend: Literal["chroma", "memory"] = "chroma",
+        embed_workers: int = DEFAULT_EMBED_WORKERS,
+        num_shards: int = 1
     ):
         """
         Initialize ChromaDB vector store.
@@ -33,6 +71,17 @@ class ChromaVectorStore:
             persist_directory: Directory to persist ChromaDB data
             collection_name: Name of the collection
             embedding_model: Embedding model instance
+            batch_size: Number of documents embedded and added per batch
+            backend: "chroma" persists to ChromaDB; "memory" keeps embeddings
+                in an in-process NumPy index (nothing is persisted), which is
+                faster for small collections (<10k documents)
+            embed_workers: Number of batches embedded concurrently by
+                add_documents; writes stay sequential and in order
+            num_shards: Split documents across this many collections named
+                "{collection_name}__shard{i}" (by a hash of the document ID)
+                so each HNSW index stays small; queries fan out to every
+                shard and merge the top k. 1 uses a single collection named
+                collection_name
 
         Example:
             >>> from src.vectorstore.embeddings import OpenAIEmbedding
@@ -42,6 +91,27 @@ class ChromaVectorStore:
         self.persist_directory = Path(persist_directory)
         self.collection_name = collection_name
         self.embedding_model = embedding_model
+        self.batch_size = max(1, batch_size)
+        self.embed_workers = max(1, embed_workers)
+        self.num_shards = max(1, num_shards)
+        self.collections: List[Any] = []
+        # Serializes writes so the cached document count stays consistent
+        self._write_lock = threading.Lock()
+
+        if backend not in ("chroma", "memory"):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+
+        # Document count tracked locally so stats don't re-run COUNT(*); assumes
+        # this instance is the only writer to the collection
+        self._count_cache: Optional[int] = None
+
+        if backend == "memory":
+            self.client = None
+            self.collections = self._create_collections()
+            self._count_cache = 0
+            logger.info(f"In-memory vector store initialized: collection='{collection_name}'")
+            return
 
         # Ensure directory exists
         self.persist_directory.mkdir(parents=True, exist_ok=True)
@@ -49,74 +119,240 @@ class ChromaVectorStore:
         logger.info(f"Initializing ChromaDB at: {persist_directory}")
 
         try:
+            # Import lazily: chromadb is heavy and only needed once a store exists
+            import chromadb
+            from chromadb.config import Settings
+
             # Initialize ChromaDB client with persistence
             self.client = chromadb.PersistentClient(
                 path=str(self.persist_directory),
                 settings=Settings(anonymized_telemetry=False)
             )
 
-            # Get or create collection
-            self.collection = self.client.get_or_create_collection(
-                name=collection_name,
-                metadata={"hnsw:space": "cosine"}  # Use cosine similarity
-            )
+            # Get or create collection(s)
+            self.collections = self._create_collections()
+
+            self._count_cache = sum(collection.count() for collection in self.collections)
 
             logger.info(
                 f"ChromaDB initialized: collection='{collection_name}', "
-                f"documents={self.collection.count()}"
+                f"documents={self._count_cache}"
             )
 
         except Exception as e:
             logger.error(f"Failed to initialize ChromaDB: {str(e)}")
             raise
 
-    def add_documents(self, documents: List[Document]) -> None:
+    @property
+    def collection(self):
+        """The first collection (the only one unless the store is sharded)."""
+        return self.collections[0]
+
+    def _shard_names(self) -> List[str]:
+        """Return the collection name of each shard."""
+        if self.num_shards == 1:
+            return [self.collection_name]
+        return [f"{self.collection_name}__shard{i}" for i in range(self.num_shards)]
+
+    def _create_collections(self) -> List[Any]:
+        """Get or create one collection per shard."""
+        if self.backend == "memory":
+            return [InMemoryIndex() for _ in range(self.num_shards)]
+
+        return [
+            self.client.get_or_create_collection(
+                name=name,
+                metadata={"hnsw:space": "cosine"}  # Use cosine similarity
+            )
+            for name in self._shard_names()
+        ]
+
+    def _group_by_shard(self, ids: List[str]) -> Dict[int, List[int]]:
+        """Return positions of ``ids`` grouped by the shard each ID belongs to."""
+        if self.num_shards == 1:
+            return {0: list(range(len(ids)))}
+
+        shards: Dict[int, List[int]] = defaultdict(list)
+        for position, doc_id in enumerate(ids):
+            shards[_shard_for(doc_id, self.num_shards)].append(position)
+        return dict(sorted(shards.items()))
+
+    def _get_count(self) -> int:
+        """Return the cached document count, querying ChromaDB only if unknown."""
+        if self._count_cache is None:
+            self._count_cache = sum(collection.count() for collection in self.collections)
+        return self._count_cache
+
+    def add_documents(self, documents: List[Document]) -> List[str]:
         """
         Add documents to the vector store.
 
+        Documents are embedded and written in batches of ``batch_size`` so each
+        ChromaDB add() call covers many rows. Up to ``embed_workers`` batches
+        are embedded concurrently while a single writer adds finished batches
+        in order. Each document gets a random UUID, so IDs never collide
+        with documents already stored (including after truncate()). If a
+        write fails, the batches this call already wrote are deleted before
+        the error is raised, so a retry does not duplicate them.
+
         Args:
             documents: List of LangChain Document objects to add
 
+        Returns:
+            IDs assigned to the documents, in input order
+
         Example:
             >>> docs = [Document(page_content="text", metadata={"source": "url"})]
-            >>> store.add_documents(docs)
+            >>> ids = store.add_documents(docs)
         """
         if not documents:
             logger.warning("No documents to add")
-            return
+            return []
 
         logger.info(f"Adding {len(documents)} documents to vector store")
 
+        batches = [
+            documents[offset:offset + self.batch_size]
+            for offset in range(0, len(documents), self.batch_size)
+        ]
+
         try:
-            # Extract texts and metadata
-            texts = [doc.page_content for doc in documents]
-            metadatas = [doc.metadata for doc in documents]
-
-            # Generate embeddings
-            logger.debug(f"Generating embeddings for {len(texts)} documents")
-            embeddings = self.embedding_model.embed_documents(texts)
-
-            # Generate IDs
-            start_id = self.collection.count()
-            ids = [f"doc_{start_id + i}" for i in range(len(documents))]
-
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=texts,
-                metadatas=metadatas
-            )
+            with self._write_lock, ThreadPoolExecutor(
+                max_workers=min(self.embed_workers, len(batches))
+            ) as executor:
+                # Embed batches in worker threads; this thread writes them in order
+                futures = [executor.submit(self._embed_batch, batch) for batch in batches]
+
+                try:
+                    ids = self._write_batches(batches, futures)
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
 
             logger.info(
                 f"Successfully added {len(documents)} documents. "
-                f"Total in collection: {self.collection.count()}"
+                f"Total in collection: {self._count_cache}"
             )
 
+            return ids
+
         except Exception as e:
             logger.error(f"Failed to add documents: {str(e)}")
             raise
 
+    def _embed_batch(self, batch: List[Document]) -> np.ndarray:
+        """Embed one batch as a contiguous (batch, dim) float32 matrix for ChromaDB."""
+        logger.debug(f"Embedding batch of {len(batch)} documents")
+        return np.ascontiguousarray(
+            self.embedding_model.embed_documents([doc.page_content for doc in batch]),
+            dtype=np.float32
+        )
+
+    def _write_batches(self, batches: List[List[Document]], futures: List) -> List[str]:
+        """
+        Write embedded batches to the collection in order as they complete.
+
+        If any write fails, the documents already written by this call are
+        deleted before the error is re-raised, so a failed add leaves the
+        collection as it was.
+        """
+        count = self._get_count()
+        all_ids: List[str] = []
+        # IDs already added to a collection, deleted again if a later write fails
+        written: List[str] = []
+
+        try:
+            for number, (batch, future) in enumerate(zip(batches, futures), 1):
+                embeddings = future.result()
+                ids = [str(uuid.uuid4()) for _ in batch]
+                texts = [doc.page_content for doc in batch]
+                metadatas = [_sanitize_metadata(doc.metadata) for doc in batch]
+
+                logger.debug(f"Writing batch {number}/{len(batches)} ({len(batch)} documents)")
+
+                for shard, rows in self._group_by_shard(ids).items():
+                    collection = self.collections[shard]
+
+                    # Add to ChromaDB
+                    if len(rows) == len(batch):
+                        collection.add(
+                            ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas
+                        )
+                    else:
+                        collection.add(
+                            ids=[ids[row] for row in rows],
+                            embeddings=embeddings[rows],
+                            documents=[texts[row] for row in rows],
+                            metadatas=[metadatas[row] for row in rows]
+                        )
+                    written.extend(ids[row] for row in rows)
+
+                count += len(batch)
+                self._count_cache = count
+                all_ids.extend(ids)
+
+        except Exception:
+            if written:
+                logger.warning(f"Rolling back {len(written)} documents written before the failure")
+                for shard, positions in self._group_by_shard(written).items():
+                    self.collections[shard].delete(ids=[written[i] for i in positions])
+                self._count_cache = None
+            raise
+
+        return all_ids
+
+    def _query(
+        self,
+        query_embedding: np.ndarray,
+        k: int,
+        where: Optional[Dict]
+    ) -> Dict[str, List[List[Any]]]:
+        """
+        Query every shard for the top k and merge the results.
+
+        Returns:
+            ChromaDB-style query result for a single query embedding
+        """
+        def query_shard(collection):
+            return collection.query(
+                query_embeddings=[query_embedding],
+                n_results=k,
+                where=where  # Optional metadata filter
+            )
+
+        if self.num_shards == 1:
+            return query_shard(self.collection)
+
+        with ThreadPoolExecutor(max_workers=self.num_shards) as executor:
+            shard_results = list(executor.map(query_shard, self.collections))
+
+        # Keep the k smallest distances across all shards
+        best = heapq.nsmallest(
+            k,
+            (
+                row
+                for results in shard_results
+                for row in zip(
+                    results['distances'][0],
+                    results['ids'][0],
+                    results['documents'][0],
+                    results['metadatas'][0]
+                )
+            ),
+            key=lambda row: row[0]
+        )
+        distances, ids, documents, metadatas = (
+            list(column) for column in (zip(*best) if best else ((), (), (), ()))
+        )
+
+        return {
+            'ids': [ids],
+            'documents': [documents],
+            'metadatas': [metadatas],
+            'distances': [distances]
+        }
+
     def similarity_search(
         self,
         query: str,
@@ -142,30 +378,28 @@ class ChromaVectorStore:
         logger.debug(f"Searching for: '{query}' (k={k})")
 
         try:
-            # Generate query embedding
+            # Generate query embedding (OpenAIEmbedding caches repeated queries)
             query_embedding = self.embedding_model.embed_query(query)
 
-            # Search in ChromaDB
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=k,
-                where=filter  # Optional metadata filter
-            )
+            # Search in ChromaDB (every shard, merged)
+            results = self._query(query_embedding, k, filter)
 
             # Parse results
             documents_with_scores = []
 
             if results['ids'][0]:  # Check if we have results
-                for i in range(len(results['ids'][0])):
-                    doc = Document(
-                        page_content=results['documents'][0][i],
-                        metadata=results['metadatas'][0][i]
+                # ChromaDB returns distances, convert to similarity (1 - distance)
+                # for all results at once
+                similarities = 1.0 - np.asarray(results['distances'][0], dtype=np.float64)
+
+                documents_with_scores = [
+                    (Document(page_content=text, metadata=metadata or {}), similarity)
+                    for text, metadata, similarity in zip(
+                        results['documents'][0],
+                        results['metadatas'][0],
+                        similarities.tolist()
                     )
-                    # ChromaDB returns distances, convert to similarity (1 - distance)
-                    distance = results['distances'][0][i]
-                    similarity = 1.0 - distance
-
-                    documents_with_scores.append((doc, similarity))
+                ]
 
             logger.info(f"Found {len(documents_with_scores)} similar documents")
 
@@ -183,7 +417,7 @@ class ChromaVectorStore:
             Dictionary with collection statistics
         """
         try:
-            count = self.collection.count()
+            count = self._get_count()
 
             return {
                 "collection_name": self.collection_name,
@@ -200,6 +434,41 @@ class ChromaVectorStore:
                 "error": str(e)
             }
 
+    def truncate(self, ids: Optional[List[str]] = None) -> None:
+        """
+        Delete documents by ID, or every document when no IDs are given.
+
+        Deleting a subset removes the rows in a single delete() call and keeps
+        the collection (and its index) instead of rebuilding it from scratch.
+
+        Args:
+            ids: Document IDs to delete; None clears the whole collection
+
+        Example:
+            >>> ids = store.add_documents(docs)
+            >>> store.truncate(ids=ids[:2])
+        """
+        if ids is None:
+            self.clear_collection()
+            return
+
+        if not ids:
+            logger.warning("No document IDs to delete")
+            return
+
+        logger.info(f"Deleting {len(ids)} documents from {self.collection_name}")
+
+        try:
+            with self._write_lock:
+                for shard, positions in self._group_by_shard(ids).items():
+                    self.collections[shard].delete(ids=[ids[i] for i in positions])
+                # Some IDs may not have existed, so recount on next use
+                self._count_cache = None
+
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {str(e)}")
+            raise
+
     def clear_collection(self) -> None:
         """
         Clear all documents from the collection.
@@ -208,18 +477,24 @@ class ChromaVectorStore:
         """
         logger.warning(f"Clearing collection: {self.collection_name}")
 
-        try:
-            # Delete the collection
-            self.client.delete_collection(name=self.collection_name)
+        with self._write_lock:
+            if self.backend == "memory":
+                self.collections = self._create_collections()
+                self._count_cache = 0
+                logger.info(f"Collection cleared: {self.collection_name}")
+                return
 
-            # Recreate empty collection
-            self.collection = self.client.get_or_create_collection(
-                name=self.collection_name,
-                metadata={"hnsw:space": "cosine"}
-            )
+            try:
+                # Delete the collection(s)
+                for name in self._shard_names():
+                    self.client.delete_collection(name=name)
 
-            logger.info(f"Collection cleared: {self.collection_name}")
+                # Recreate empty collection(s)
+                self.collections = self._create_collections()
+                self._count_cache = 0
 
-        except Exception as e:
-            logger.error(f"Failed to clear collection: {str(e)}")
-            raise
+                logger.info(f"Collection cleared: {self.collection_name}")
+
+            except Exception as e:
+                logger.error(f"Failed to clear collection: {str(e)}")
+                raise
@@ -4,19 +4,97 @@ Embedding models for vector store.
 This module provides embedding model wrappers for OpenAI embeddings.
 """
 
+import asyncio
+import base64
+import hashlib
+import sqlite3
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
 
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Maximum number of embeddings kept in the in-process LRU cache
+DEFAULT_CACHE_SIZE = 1024
+
+# OpenAI accepts at most this many inputs per embeddings request
+MAX_BATCH_SIZE = 2048
+
+# Maximum number of embedding requests in flight at once
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Request embeddings as base64 float32 bytes so they decode straight into numpy
+EMBEDDING_ENCODING_FORMAT = "base64"
+
+# Embedding cache value: a float32 vector or an int8 (vector, scale) pair
+CacheEntry = Union[np.ndarray, Tuple[np.ndarray, float]]
+
+# Table backing the optional on-disk embedding cache (vec holds float32 bytes)
+EMBEDDING_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    sha BLOB NOT NULL,
+    vec BLOB NOT NULL,
+    ts INTEGER NOT NULL,
+    PRIMARY KEY (model, sha)
+)
+"""
+
+# Keys per SELECT ... IN (...) against the on-disk cache, kept below SQLite's
+# historical 999 host-parameter limit
+DISK_LOOKUP_CHUNK_SIZE = 900
+
+
+def _quantize(v: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Quantize a vector to int8 with a single symmetric per-vector scale.
+
+    Args:
+        v: float vector
+
+    Returns:
+        Tuple of (int8 vector, scale) such that ``q * scale`` approximates v
+    """
+    scale = float(np.max(np.abs(v))) / 127 if v.size else 0.0
+    if scale == 0.0:
+        return np.zeros(v.shape, dtype=np.int8), 1.0
+    return np.round(v / scale).astype(np.int8), scale
+
+
+def _dequantize(q: np.ndarray, scale: float) -> np.ndarray:
+    """Reconstruct a float32 vector from its int8 quantization."""
+    return q.astype(np.float32) * np.float32(scale)
+
+
+def _decode_embedding(embedding: Union[str, List[float]]) -> np.ndarray:
+    """
+    Convert an API embedding into a float32 vector.
+
+    Args:
+        embedding: base64-encoded float32 bytes, or a list of floats from
+            clients that ignore encoding_format
+
+    Returns:
+        float32 embedding vector
+    """
+    if isinstance(embedding, str):
+        return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+    return np.asarray(embedding, dtype=np.float32)
+
 
 class EmbeddingModel(ABC):
     """Abstract base class for embedding models."""
 
     @abstractmethod
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
         """
         Embed a list of documents.
 
@@ -24,12 +102,12 @@ class EmbeddingModel(ABC):
             texts: List of text strings to embed
 
         Returns:
-            List of embedding vectors (list of floats)
+            float32 array of shape (len(texts), dim), one row per text
         """
         pass
 
     @abstractmethod
-    def embed_query(self, text: str) -> List[float]:
+    def embed_query(self, text: str) -> np.ndarray:
         """
         Embed a single query.
 
@@ -37,7 +115,7 @@ class EmbeddingModel(ABC):
             text: Query text to embed
 
         Returns:
-            Embedding vector (list of floats)
+            float32 embedding vector of shape (dim,)
         """
         pass
 
@@ -45,51 +123,378 @@ class EmbeddingModel(ABC):
 class OpenAIEmbedding(EmbeddingModel):
     """OpenAI embeddings (requires API key, costs money)."""
 
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-small",
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        quantize_cache: bool = False,
+        cache_path: Optional[str] = None
+    ):
         """
         Initialize OpenAI embeddings.
 
         Args:
             api_key: OpenAI API key
             model: Embedding model name
+            cache_size: Maximum number of embeddings kept in the LRU cache
+                (0 disables caching)
+            max_concurrency: Maximum concurrent requests when a call spans
+                several batches
+            quantize_cache: Store cached embeddings as int8 with a per-vector
+                scale (about 4x smaller). Cache hits then return a close
+                approximation (cosine similarity > 0.999) instead of the
+                exact API vector
+            cache_path: Optional SQLite file that persists embeddings across
+                process restarts, so unchanged texts are never re-embedded.
+                Rows are never evicted, so the file grows with every new
+                text; delete it (or prune rows by their ts column) to reclaim
+                space. Call close() or use the embedder as a context manager
+                to release the connection
         """
         from openai import OpenAI
 
         self.model = model
         self.client = OpenAI(api_key=api_key)
+        # Only aembed_documents needs the async client, so it is created on first use
+        self._api_key = api_key
+        self._async_client = None
+        self.cache_size = cache_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.quantize_cache = quantize_cache
+        # Values are float32 vectors, or (int8 vector, scale) when quantize_cache
+        self._cache: "OrderedDict[Tuple[str, bytes], CacheEntry]" = OrderedDict()
+        # Guards the LRU when embed calls run in several threads
+        self._cache_lock = threading.Lock()
+
+        self.cache_path = cache_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if cache_path:
+            Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                cache_path,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(EMBEDDING_CACHE_SCHEMA)
+            logger.info(f"Using persistent embedding cache: {cache_path}")
 
         logger.info(f"Initialized OpenAI embeddings: {model}")
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    @property
+    def async_client(self):
+        """AsyncOpenAI client for aembed_documents, created on first access."""
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+
+            self._async_client = AsyncOpenAI(api_key=self._api_key)
+        return self._async_client
+
+    @async_client.setter
+    def async_client(self, client) -> None:
+        self._async_client = client
+
+    def _cache_key(self, text: str) -> Tuple[str, bytes]:
+        """Build the cache key for a text under the current model."""
+        return (self.model, hashlib.sha256(text.encode("utf-8")).digest())
+
+    def _memory_get(self, key: Tuple[str, bytes]) -> Optional[np.ndarray]:
+        """Return an embedding from the in-process LRU (marking it recently used) or None."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+        if isinstance(entry, tuple):
+            return _dequantize(*entry)
+        return entry
+
+    def _cache_get(self, key: Tuple[str, bytes]) -> Optional[np.ndarray]:
+        """Return a cached embedding from memory or the persistent cache, or None."""
+        embedding = self._memory_get(key)
+        if embedding is None:
+            embedding = self._disk_get_many([key]).get(key)
+        return embedding
+
+    def _cache_put(self, key: Tuple[str, bytes], embedding: np.ndarray) -> None:
+        """Store an embedding, evicting the least recently used entry if full."""
+        if self.cache_size <= 0:
+            return
+        if self.quantize_cache:
+            entry = _quantize(embedding)
+        else:
+            # Cached vectors are shared between callers, so keep them read-only
+            embedding.flags.writeable = False
+            entry = embedding
+        with self._cache_lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _disk_get_many(
+        self,
+        keys: List[Tuple[str, bytes]]
+    ) -> Dict[Tuple[str, bytes], np.ndarray]:
+        """
+        Look up keys in the persistent cache, promoting hits to memory.
+
+        Keys are fetched with one SELECT ... IN (...) per model and chunk of
+        DISK_LOOKUP_CHUNK_SIZE keys rather than one query per key.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dict mapping each key found on disk to its embedding
+        """
+        if self._db is None or not keys:
+            return {}
+
+        shas_by_model: Dict[str, List[bytes]] = {}
+        for model, sha in dict.fromkeys(keys):
+            shas_by_model.setdefault(model, []).append(sha)
+
+        found = {}
+        with self._db_lock:
+            for model, shas in shas_by_model.items():
+                for start in range(0, len(shas), DISK_LOOKUP_CHUNK_SIZE):
+                    chunk = shas[start:start + DISK_LOOKUP_CHUNK_SIZE]
+                    rows = self._db.execute(
+                        "SELECT sha, vec FROM embedding_cache "
+                        f"WHERE model=? AND sha IN ({', '.join('?' * len(chunk))})",
+                        (model, *chunk)
+                    ).fetchall()
+                    for sha, vec in rows:
+                        found[(model, sha)] = np.frombuffer(vec, dtype=np.float32)
+
+        for key, embedding in found.items():
+            self._cache_put(key, embedding)
+        return found
+
+    def _persist(self, items: Iterable[Tuple[Tuple[str, bytes], np.ndarray]]) -> None:
+        """Write freshly fetched embeddings to the persistent cache, if enabled."""
+        if self._db is None:
+            return
+
+        now = int(time.time())
+        rows = [
+            (model, sha, np.asarray(embedding, dtype=np.float32).tobytes(), now)
+            for (model, sha), embedding in items
+        ]
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (model, sha, vec, ts) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def _lookup_cache(self, texts: List[str]):
+        """
+        Split texts into cached embeddings and texts that still need the API.
+
+        Returns:
+            Tuple of (keys, cached embedding or None per text, dict mapping
+            key -> text for unique uncached texts in first-seen order)
+        """
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = [self._memory_get(key) for key in keys]
+
+        # Fetch every memory miss from the persistent cache in one pass
+        on_disk = self._disk_get_many([key for key, e in zip(keys, embeddings) if e is None])
+        if on_disk:
+            embeddings = [
+                embedding if embedding is not None else on_disk.get(key)
+                for key, embedding in zip(keys, embeddings)
+            ]
+
+        missing = {}
+        for text, key, embedding in zip(texts, keys, embeddings):
+            if embedding is None and key not in missing:
+                missing[key] = text
+
+        return keys, embeddings, missing
+
+    def _merge_embeddings(self, keys, embeddings, missing, rows) -> np.ndarray:
+        """Cache freshly fetched rows and assemble the result in input order."""
+        fetched = dict(zip(missing, rows))
+        for key, embedding in fetched.items():
+            self._cache_put(key, embedding)
+        self._persist(fetched.items())
+
+        return np.stack([
+            embedding if embedding is not None else fetched[key]
+            for key, embedding in zip(keys, embeddings)
+        ])
+
+    @staticmethod
+    def _batches(texts: List[str]) -> List[List[str]]:
+        """Split texts into request-sized batches of up to MAX_BATCH_SIZE."""
+        return [
+            texts[start:start + MAX_BATCH_SIZE]
+            for start in range(0, len(texts), MAX_BATCH_SIZE)
+        ]
+
+    @staticmethod
+    def _response_rows(response) -> List[np.ndarray]:
+        """Convert an embeddings response into float32 rows."""
+        return [_decode_embedding(item.embedding) for item in response.data]
+
+    def _fetch_batch(self, batch: List[str]) -> List[np.ndarray]:
+        """Embed one batch with the sync client."""
+        response = self.client.embeddings.create(
+            input=batch,
+            model=self.model,
+            encoding_format=EMBEDDING_ENCODING_FORMAT
+        )
+        return self._response_rows(response)
+
+    def _fetch_batches(self, batches: List[List[str]]) -> List[np.ndarray]:
+        """Embed batches with the sync client, up to max_concurrency at once."""
+        if len(batches) == 1:
+            return self._fetch_batch(batches[0])
+
+        # The sync client is thread-safe and, unlike the async client, not
+        # tied to an event loop, so repeated calls can share its connections
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            results = list(executor.map(self._fetch_batch, batches))
+
+        return [row for rows in results for row in rows]
+
+    async def _afetch_batches(self, batches: List[List[str]]) -> List[np.ndarray]:
+        """Embed batches concurrently with the async client."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(batch: List[str]) -> List[np.ndarray]:
+            async with semaphore:
+                response = await self.async_client.embeddings.create(
+                    input=batch,
+                    model=self.model,
+                    encoding_format=EMBEDDING_ENCODING_FORMAT
+                )
+            return self._response_rows(response)
+
+        results = await asyncio.gather(*(fetch(batch) for batch in batches))
+
+        return [row for rows in results for row in rows]
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
         """
         Embed a list of documents.
 
+        Cached texts are served from memory; the remaining texts are sent to the
+        API in batches of up to MAX_BATCH_SIZE inputs. When more than one batch
+        is needed the batches are sent concurrently from a thread pool over the
+        sync client.
+
         Args:
             texts: List of text strings
 
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dim), one row per text
         """
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32)
+
+        # With caching disabled and one request's worth of texts, skip the
+        # cache partition and batching entirely
+        if len(texts) <= MAX_BATCH_SIZE and self.cache_size <= 0 and self._db is None:
+            return self._embed_documents_uncached(texts)
 
+        return self._embed_documents_cached(texts)
+
+    def _embed_documents_uncached(self, texts: List[str]) -> np.ndarray:
+        """Embed up to MAX_BATCH_SIZE texts with a single request, bypassing the cache."""
         logger.debug(f"Embedding {len(texts)} documents with OpenAI")
 
         try:
             response = self.client.embeddings.create(
                 input=texts,
-                model=self.model
+                model=self.model,
+                encoding_format=EMBEDDING_ENCODING_FORMAT
             )
+            return np.stack(self._response_rows(response))
+
+        except Exception as e:
+            logger.error(f"Failed to embed documents with OpenAI: {str(e)}")
+            raise
+
+    def _embed_documents_cached(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, serving cached ones and batching the rest."""
+        keys, embeddings, missing = self._lookup_cache(texts)
+
+        if not missing:
+            logger.debug(f"Embedding cache hit for all {len(texts)} documents")
+            return np.stack(embeddings)
+
+        logger.debug(
+            f"Embedding {len(missing)} documents with OpenAI "
+            f"({len(texts) - len(missing)} served from cache)"
+        )
+
+        try:
+            batches = self._batches(list(missing.values()))
 
-            embeddings = [item.embedding for item in response.data]
+            rows = self._fetch_batches(batches)
 
-            return embeddings
+            return self._merge_embeddings(keys, embeddings, missing, rows)
 
         except Exception as e:
             logger.error(f"Failed to embed documents with OpenAI: {str(e)}")
             raise
 
-    def embed_query(self, text: str) -> List[float]:
+    async def aembed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of documents, sending batches concurrently.
+
+        At most ``max_concurrency`` requests are in flight at once. The async
+        client's connection pool is bound to the event loop it first runs on,
+        so call this from one long-lived loop; use embed_documents otherwise.
+
+        Args:
+            texts: List of text strings
+
+        Returns:
+            float32 array of shape (len(texts), dim), one row per text
+
+        Example:
+            >>> embeddings = await embedder.aembed_documents(texts)
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        keys, embeddings, missing = self._lookup_cache(texts)
+
+        if not missing:
+            return np.stack(embeddings)
+
+        logger.debug(f"Embedding {len(missing)} documents with OpenAI (async)")
+
+        try:
+            rows = await self._afetch_batches(self._batches(list(missing.values())))
+
+            return self._merge_embeddings(keys, embeddings, missing, rows)
+
+        except Exception as e:
+            logger.error(f"Failed to embed documents with OpenAI: {str(e)}")
+            raise
+
+    def close(self) -> None:
+        """Close the persistent cache connection, if one is open."""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+
+    def __enter__(self) -> "OpenAIEmbedding":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def embed_query(self, text: str) -> np.ndarray:
         """
         Embed a single query.
 
@@ -97,17 +502,26 @@ class OpenAIEmbedding(EmbeddingModel):
             text: Query text
 
         Returns:
-            Embedding vector
+            float32 embedding vector of shape (dim,)
         """
+        key = self._cache_key(text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.debug(f"Embedding cache hit for query: {text[:50]}...")
+            return cached
+
         logger.debug(f"Embedding query with OpenAI: {text[:50]}...")
 
         try:
             response = self.client.embeddings.create(
                 input=[text],
-                model=self.model
+                model=self.model,
+                encoding_format=EMBEDDING_ENCODING_FORMAT
             )
 
-            embedding = response.data[0].embedding
+            embedding = _decode_embedding(response.data[0].embedding)
+            self._cache_put(key, embedding)
+            self._persist([(key, embedding)])
 
             return embedding
 
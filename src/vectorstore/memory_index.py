@@ -0,0 +1,155 @@
+"""
+In-process vector index for small collections.
+
+This module provides a NumPy-backed stand-in for a ChromaDB collection. It
+keeps every embedding in one (N, d) float32 matrix and answers queries with a
+single matrix-vector product, which is faster than a round-trip through
+ChromaDB's HNSW index for prototype-sized collections (roughly <10k vectors).
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class InMemoryIndex:
+    """
+    Brute-force cosine similarity index exposing the ChromaDB collection calls
+    used by ChromaVectorStore (add, delete, query, count).
+
+    Embeddings are L2-normalized on insert so cosine similarity reduces to a
+    dot product. Nothing is persisted.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        # Normalized embeddings are appended per add() call and stacked lazily
+        self._blocks: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(N, d) float32 matrix of L2-normalized embeddings."""
+        if self._matrix is None:
+            if not self._blocks:
+                return np.empty((0, 0), dtype=np.float32)
+            self._matrix = np.concatenate(self._blocks) if len(self._blocks) > 1 else self._blocks[0]
+            self._blocks = [self._matrix]
+        return self._matrix
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def count(self) -> int:
+        """Return the number of stored embeddings."""
+        return len(self._ids)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Any,
+        documents: Sequence[str],
+        metadatas: Sequence[Optional[Dict[str, Any]]]
+    ) -> None:
+        """
+        Add embeddings with their documents and metadata.
+
+        Args:
+            ids: Unique ID per embedding
+            embeddings: (n, d) embedding matrix
+            documents: Document text per embedding
+            metadatas: Metadata dict (or None) per embedding
+        """
+        vectors = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if not len(ids) == len(vectors) == len(documents) == len(metadatas):
+            raise ValueError("ids, embeddings, documents and metadatas must have the same length")
+
+        self._blocks.append(self._normalize(vectors))
+        self._matrix = None
+        self._ids.extend(ids)
+        self._documents.extend(documents)
+        self._metadatas.extend(metadatas)
+
+        logger.debug(f"Added {len(ids)} embeddings to in-memory index (total {self.count()})")
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """
+        Remove stored embeddings by ID; unknown IDs are ignored.
+
+        Args:
+            ids: IDs to remove
+        """
+        doomed = set(ids)
+        keep = [i for i, id_ in enumerate(self._ids) if id_ not in doomed]
+        if len(keep) == len(self._ids):
+            return
+
+        matrix = self.matrix[keep]
+        self._blocks = [matrix] if len(matrix) else []
+        self._matrix = None
+        self._ids = [self._ids[i] for i in keep]
+        self._documents = [self._documents[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+
+    def _matching_rows(self, where: Dict[str, Any]) -> np.ndarray:
+        """Return indices of rows whose metadata equals every key in ``where``."""
+        if any(key.startswith("$") for key in where):
+            raise ValueError(f"Unsupported filter operator in: {where}")
+
+        return np.fromiter(
+            (
+                i for i, metadata in enumerate(self._metadatas)
+                if metadata and all(metadata.get(key) == value for key, value in where.items())
+            ),
+            dtype=np.intp
+        )
+
+    def query(
+        self,
+        query_embeddings: Sequence[Any],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """
+        Return the nearest stored embeddings for each query embedding.
+
+        Args:
+            query_embeddings: Query vectors
+            n_results: Number of results per query
+            where: Optional metadata equality filter (e.g., {"source_type": "pdf"})
+
+        Returns:
+            ChromaDB-style result dict with ids, documents, metadatas and cosine
+            distances (1 - similarity), one inner list per query
+        """
+        results: Dict[str, List[List[Any]]] = {
+            "ids": [], "documents": [], "metadatas": [], "distances": []
+        }
+
+        rows = self._matching_rows(where) if where else None
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        queries = self._normalize(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+
+        for query in queries:
+            scores = matrix @ query if len(matrix) else np.empty(0, dtype=np.float32)
+            k = min(n_results, len(scores))
+
+            # Partial selection of the k best, then sort only those k
+            top = np.argpartition(-scores, k - 1)[:k] if k > 0 else np.empty(0, dtype=np.intp)
+            top = top[np.argsort(-scores[top], kind="stable")]
+            indices = (top if rows is None else rows[top]).tolist()
+
+            results["ids"].append([self._ids[i] for i in indices])
+            results["documents"].append([self._documents[i] for i in indices])
+            results["metadatas"].append([self._metadatas[i] for i in indices])
+            results["distances"].append((1.0 - scores[top].astype(np.float64)).tolist())
+
+        return results
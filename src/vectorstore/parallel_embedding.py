@@ -4,6 +4,7 @@ Parallel document processing using Ray.
 This module provides parallelized chunking and embedding using Ray for improved performance.
 """
 
+import numpy as np
 import ray
 from typing import List
 from langchain_core.documents import Document
@@ -60,7 +61,7 @@ class ParallelEmbedder:
         else:
             raise ValueError(f"Unsupported embedding model type: {embedding_model_config['type']}")
 
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
         """
         Embed a batch of texts.
 
@@ -68,7 +69,7 @@ class ParallelEmbedder:
             texts: List of text strings
 
         Returns:
-            List of embedding vectors
+            float32 array of embedding vectors, one row per text
         """
         return self.model.embed_documents(texts)
 
@@ -125,7 +126,7 @@ def parallel_embed_documents(
     model_name: str = "text-embedding-3-small",
     num_workers: int = 4,
     batch_size: int = 100
-) -> List[List[float]]:
+) -> List[np.ndarray]:
     """
     Generate embeddings for chunks in parallel using Ray.
 
@@ -138,7 +139,7 @@ def parallel_embed_documents(
         batch_size: Number of texts per batch
 
     Returns:
-        List of embedding vectors
+        List of float32 embedding vectors
     """
     ensure_ray_initialized()
 
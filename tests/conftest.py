@@ -8,9 +8,19 @@ import pytest
 import tempfile
 import shutil
 from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import Mock, MagicMock
 from langchain_core.documents import Document
 
+# Import the heavy source modules once when conftest loads, so each xdist
+# worker pays the langchain/openai/pydantic import chain up front rather
+# than inside whichever test module it happens to collect first.
+import src.generation.agent  # noqa: F401
+import src.generation.answer_generator  # noqa: F401
+import src.generation.tools  # noqa: F401
+import src.ingestion.article_downloader  # noqa: F401
+import src.ingestion.chunker  # noqa: F401
+
 # Sample test data
 SAMPLE_TEXT = """
 This is a sample article about machine learning.
@@ -29,11 +39,14 @@ Introduction:
 Machine learning has revolutionized many industries...
 """
 
-SAMPLE_YOUTUBE_TRANSCRIPT = [
-    {"text": "Welcome to this video", "start": 0.0, "duration": 2.0},
-    {"text": "Today we'll discuss AI", "start": 2.0, "duration": 3.0},
-    {"text": "Let's get started", "start": 5.0, "duration": 2.0},
-]
+# Read-only segments, shared by every test without per-test copies
+SAMPLE_YOUTUBE_TRANSCRIPT = tuple(
+    MappingProxyType(segment) for segment in (
+        {"text": "Welcome to this video", "start": 0.0, "duration": 2.0},
+        {"text": "Today we'll discuss AI", "start": 2.0, "duration": 3.0},
+        {"text": "Let's get started", "start": 5.0, "duration": 2.0},
+    )
+)
 
 
 @pytest.fixture
@@ -76,25 +89,36 @@ def sample_documents():
     ]
 
 
-@pytest.fixture
-def mock_openai_client():
-    """Create a mock OpenAI client."""
-    client = Mock()
-
-    # Mock chat completions
+@pytest.fixture(scope="session")
+def _openai_completion_template():
+    """Build the mock chat completion response once; tests only read it."""
     completion_response = Mock()
     completion_response.choices = [Mock()]
     completion_response.choices[0].message.content = "This is a test response."
     completion_response.usage.total_tokens = 100
     completion_response.usage.prompt_tokens = 50
     completion_response.usage.completion_tokens = 50
+    return completion_response
 
-    client.chat.completions.create.return_value = completion_response
 
-    # Mock embeddings
+@pytest.fixture(scope="session")
+def _openai_embedding_template():
+    """Build the mock embeddings response once; tests only read it."""
     embedding_response = Mock()
     embedding_response.data = [Mock(embedding=[0.1] * 1536)]
-    client.embeddings.create.return_value = embedding_response
+    return embedding_response
+
+
+@pytest.fixture
+def mock_openai_client(_openai_completion_template, _openai_embedding_template):
+    """Create a mock OpenAI client."""
+    client = Mock()
+
+    # Mock chat completions
+    client.chat.completions.create.return_value = _openai_completion_template
+
+    # Mock embeddings
+    client.embeddings.create.return_value = _openai_embedding_template
 
     return client
 
@@ -86,7 +86,7 @@ class TestRAGPipeline:
         embeddings = embedder.embed_documents(texts)
 
         assert len(embeddings) == len(texts)
-        assert all(isinstance(e, list) for e in embeddings)
+        assert embeddings.shape == (len(texts), 1536)
 
     def test_retrieve_and_generate_pipeline(
         self, mock_openai_client, sample_documents
@@ -382,6 +382,7 @@ class TestEndToEndScenarios:
             mock_page = MagicMock()
             mock_page.get_text.return_value = "Machine learning research content"
             mock_doc.__getitem__.return_value = mock_page
+            mock_doc.__iter__.return_value = iter([mock_page])
             mock_fitz.return_value = mock_doc
 
             doc = load_pdf_from_file(str(test_pdf))
@@ -1,32 +1,58 @@
+"""
+Unit tests for agent creation.
+"""
 
-import unittest
-from unittest.mock import patch, MagicMock
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 from src.generation.agent import create_agent
 from config import get_config
 
-class TestAgent(unittest.TestCase):
-    @patch('src.generation.agent.create_langchain_agent')
-    @patch('src.generation.agent.ChatOpenAI')
-    @patch('src.generation.agent.get_tools')
-    def test_create_agent(self, mock_get_tools, mock_chat_openai, mock_create_agent):
+
+@pytest.fixture(scope="module")
+def _patched_agent_deps():
+    """Patch the agent's external dependencies once for the whole module."""
+    mocks = SimpleNamespace(
+        create_langchain_agent=MagicMock(),
+        chat_openai=MagicMock(),
+        get_tools=MagicMock(),
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('src.generation.agent.create_langchain_agent', mocks.create_langchain_agent)
+        mp.setattr('src.generation.agent.ChatOpenAI', mocks.chat_openai)
+        mp.setattr('src.generation.agent.get_tools', mocks.get_tools)
+        yield mocks
+
+
+@pytest.fixture
+def agent_deps(_patched_agent_deps):
+    """Module-wide agent mocks with call history cleared for each test."""
+    for mock in vars(_patched_agent_deps).values():
+        mock.reset_mock()
+    return _patched_agent_deps
+
+
+@pytest.mark.unit
+class TestAgent:
+    """Tests for LangChain agent creation."""
+
+    def test_create_agent(self, agent_deps):
+        """Test that the agent is built from the configured LLM and tools."""
         mock_llm = MagicMock()
-        mock_chat_openai.return_value = mock_llm
+        agent_deps.chat_openai.return_value = mock_llm
         mock_tools = [MagicMock()]
-        mock_get_tools.return_value = mock_tools
+        agent_deps.get_tools.return_value = mock_tools
         mock_agent = MagicMock()
-        mock_create_agent.return_value = mock_agent
+        agent_deps.create_langchain_agent.return_value = mock_agent
 
         config = get_config()
         agent = create_agent(config)
 
-        self.assertIsNotNone(agent)
-        self.assertEqual(agent, mock_agent)
-        mock_get_tools.assert_called_once_with(config)
-        mock_chat_openai.assert_called_once_with(
+        assert agent is not None
+        assert agent == mock_agent
+        agent_deps.get_tools.assert_called_once_with(config)
+        agent_deps.chat_openai.assert_called_once_with(
             model=config.model.generation_model,
             temperature=0,
         )
-        mock_create_agent.assert_called_once_with(mock_llm, mock_tools)
-
-if __name__ == '__main__':
-    unittest.main()
+        agent_deps.create_langchain_agent.assert_called_once_with(mock_llm, mock_tools)
@@ -4,8 +4,24 @@ Unit tests for RAG answer generation.
 
 import pytest
 from unittest.mock import Mock
+from langchain_core.documents import Document
 from src.generation.answer_generator import RAGAnswerGenerator, GeneratedAnswer
 
+# Shared page content so every long document references the same string
+LONG_CONTENT = "x" * 5000
+
+
+@pytest.fixture(scope="module")
+def long_docs():
+    """Ten 5000-char documents, built once per module (read-only)."""
+    return [
+        Document(
+            page_content=LONG_CONTENT,
+            metadata={"source": f"https://example.com/{i}"}
+        )
+        for i in range(10)
+    ]
+
 
 @pytest.mark.unit
 class TestAnswerGenerator:
@@ -95,21 +111,10 @@ class TestAnswerGenerator:
         assert "[1] https://example.com/1" in result
         assert "[2] https://example.com/2" in result
 
-    def test_context_truncation(self, mock_openai_client):
+    def test_context_truncation(self, mock_openai_client, long_docs):
         """Test that context is truncated when too long."""
-        from langchain_core.documents import Document
-
         generator = RAGAnswerGenerator(client=mock_openai_client)
 
-        # Create a very long document
-        long_docs = [
-            Document(
-                page_content="x" * 5000,
-                metadata={"source": f"https://example.com/{i}"}
-            )
-            for i in range(10)
-        ]
-
         context, sources = generator._format_context(long_docs, max_context_length=8000)
 
         # Context should be truncated
@@ -1,32 +1,58 @@
+"""
+Unit tests for agent tool construction.
+"""
 
-import unittest
-from unittest.mock import patch, MagicMock
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 from src.generation.tools import get_tools
 from config import get_config
 
-class TestTools(unittest.TestCase):
-    @patch('src.generation.tools.TavilySearchResults')
-    @patch('src.generation.tools.WikipediaQueryRun')
-    @patch('src.generation.tools.WikipediaAPIWrapper')
-    def test_get_tools(self, mock_wikipedia_api_wrapper, mock_wikipedia_query_run, mock_tavily_search_results):
+
+@pytest.fixture(scope="module")
+def _patched_tool_deps():
+    """Patch the external search tool classes once for the whole module."""
+    mocks = SimpleNamespace(
+        tavily_search_results=MagicMock(),
+        wikipedia_query_run=MagicMock(),
+        wikipedia_api_wrapper=MagicMock(),
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('src.generation.tools.TavilySearchResults', mocks.tavily_search_results)
+        mp.setattr('src.generation.tools.WikipediaQueryRun', mocks.wikipedia_query_run)
+        mp.setattr('src.generation.tools.WikipediaAPIWrapper', mocks.wikipedia_api_wrapper)
+        yield mocks
+
+
+@pytest.fixture
+def tool_deps(_patched_tool_deps):
+    """Module-wide tool mocks with call history cleared for each test."""
+    for mock in vars(_patched_tool_deps).values():
+        mock.reset_mock()
+    return _patched_tool_deps
+
+
+@pytest.mark.unit
+class TestTools:
+    """Tests for agent tool construction."""
+
+    def test_get_tools(self, tool_deps):
+        """Test that Tavily and Wikipedia tools are created from config."""
         mock_tavily = MagicMock()
         mock_wikipedia = MagicMock()
         mock_api_wrapper = MagicMock()
-        mock_tavily_search_results.return_value = mock_tavily
-        mock_wikipedia_query_run.return_value = mock_wikipedia
-        mock_wikipedia_api_wrapper.return_value = mock_api_wrapper
+        tool_deps.tavily_search_results.return_value = mock_tavily
+        tool_deps.wikipedia_query_run.return_value = mock_wikipedia
+        tool_deps.wikipedia_api_wrapper.return_value = mock_api_wrapper
 
         config = get_config()
         tools = get_tools(config)
 
-        self.assertEqual(len(tools), 2)
-        self.assertIn(mock_tavily, tools)
-        self.assertIn(mock_wikipedia, tools)
-        mock_tavily_search_results.assert_called_once_with(
+        assert len(tools) == 2
+        assert mock_tavily in tools
+        assert mock_wikipedia in tools
+        tool_deps.tavily_search_results.assert_called_once_with(
             max_results=config.search.max_search_results,
         )
-        mock_wikipedia_query_run.assert_called_once_with(api_wrapper=mock_api_wrapper)
-        mock_wikipedia_api_wrapper.assert_called_once()
-
-if __name__ == '__main__':
-    unittest.main()
+        tool_deps.wikipedia_query_run.assert_called_once_with(api_wrapper=mock_api_wrapper)
+        tool_deps.wikipedia_api_wrapper.assert_called_once()
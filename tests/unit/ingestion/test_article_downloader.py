@@ -3,6 +3,7 @@ Unit tests for article downloading and parsing.
 """
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 from src.ingestion.article_downloader import (
@@ -13,43 +14,97 @@ from src.ingestion.article_downloader import (
     download_articles_from_sources
 )
 
+# Keep the IO-heavy downloader tests on one xdist worker (--dist loadgroup)
+pytestmark = pytest.mark.xdist_group(name="ingestion_io")
+
+# Canned subprocess results for the `which wget` probe and the wget download
+_WHICH_WGET_RESULT = Mock(returncode=0, stdout="/usr/bin/wget")
+_WGET_SUCCESS_RESULT = Mock(returncode=0, stderr="")
+_WGET_FAILURE_RESULT = Mock(returncode=1, stdout="", stderr="")
+
+
+def _default_run(cmd, *args, **kwargs):
+    """Default subprocess.run for this module: fail without spawning a process."""
+    return _WGET_FAILURE_RESULT
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _freeze_subprocess():
+    """Patch subprocess.run once for the module; tests override via monkeypatch."""
+    with patch('subprocess.run', side_effect=_default_run) as mock_run:
+        yield mock_run
+
+
+def _wget_side_effect(cmd, *args, **kwargs):
+    """subprocess.run stand-in that simulates a successful wget download."""
+    if cmd[0] == 'which':
+        return _WHICH_WGET_RESULT
+    return _WGET_SUCCESS_RESULT
+
+
+@pytest.fixture
+def wget_mock_run(monkeypatch):
+    """Patch subprocess.run so wget downloads report success."""
+    mock_run = Mock(side_effect=_wget_side_effect)
+    monkeypatch.setattr('subprocess.run', mock_run)
+    return mock_run
+
+
+@pytest.fixture
+def fake_pdf_on_disk(temp_dir, monkeypatch):
+    """Make the default wget output path look like a >1KB PDF without writing it."""
+    target = temp_dir / "downloaded_article.pdf"
+    original_exists = Path.exists
+    original_stat = Path.stat
+
+    def fake_exists(self, *args, **kwargs):
+        return True if self == target else original_exists(self, *args, **kwargs)
+
+    def fake_stat(self, *args, **kwargs):
+        if self == target:
+            return SimpleNamespace(st_size=5000)
+        return original_stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, 'exists', fake_exists)
+    monkeypatch.setattr(Path, 'stat', fake_stat)
+    return target
+
 
 @pytest.mark.unit
 class TestArticleDownloader:
     """Tests for article downloading functionality."""
 
-    def test_sanitize_filename(self):
+    # Implementation preserves spaces, only replaces invalid chars: <>:"/\|?*
+    @pytest.mark.parametrize(
+        "filename,expected",
+        [
+            ("Normal Title", "Normal Title"),
+            ("Title: With Special/Characters", "Title_ With Special_Characters"),
+            ("Title?!@#$%^&*()", "Title_!@#$%^&_()"),
+            ("a" * 300, "a" * 200),  # Truncates to 200 chars by default
+        ],
+        ids=["plain", "colon-slash", "punctuation", "truncated"],
+    )
+    def test_sanitize_filename(self, filename, expected):
         """Test filename sanitization."""
-        # Implementation preserves spaces, only replaces invalid chars: <>:"/\|?*
-        assert sanitize_filename("Normal Title") == "Normal Title"
-        assert sanitize_filename("Title: With Special/Characters") == "Title_ With Special_Characters"
-        result = sanitize_filename("Title?!@#$%^&*()")
-        assert "?" not in result
-        assert "_" in result  # Invalid chars replaced with underscore
-        assert sanitize_filename("a" * 300)[:10] == "a" * 10  # Truncates to 200 chars by default
-
-    def test_is_downloadable_article(self):
+        assert sanitize_filename(filename) == expected
+
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("https://example.com/paper.pdf", True),
+            ("https://arxiv.org/pdf/2101.12345.pdf", True),
+            ("https://example.com/article.html", False),
+            ("https://youtube.com/watch?v=test", False),
+        ],
+        ids=["pdf-extension", "academic-domain", "html-page", "video"],
+    )
+    def test_is_downloadable_article(self, url, expected):
         """Test detection of downloadable articles."""
-        assert is_downloadable_article("https://example.com/paper.pdf") is True
-        assert is_downloadable_article("https://arxiv.org/pdf/2101.12345.pdf") is True
-        assert is_downloadable_article("https://example.com/article.html") is False
-        assert is_downloadable_article("https://youtube.com/watch?v=test") is False
+        assert is_downloadable_article(url) is expected
 
-    @patch('subprocess.run')
-    def test_download_article_wget_success(self, mock_run, temp_dir):
+    def test_download_article_wget_success(self, wget_mock_run, fake_pdf_on_disk, temp_dir):
         """Test successful article download with wget."""
-        # Mock which command to check wget exists
-        def run_side_effect(cmd, *args, **kwargs):
-            if cmd[0] == 'which':
-                return Mock(returncode=0, stdout="/usr/bin/wget")
-            # wget command
-            # Create the file that wget would download
-            output_path = temp_dir / "downloaded_article.pdf"
-            output_path.write_bytes(b"%PDF-1.4 " + b"test content" * 200)  # Make it > 1KB
-            return Mock(returncode=0, stderr="")
-
-        mock_run.side_effect = run_side_effect
-
         success, file_path = download_article_wget(
             url="https://example.com/paper.pdf",
             output_dir=temp_dir,
@@ -57,14 +112,11 @@ class TestArticleDownloader:
         )
 
         assert success is True
-        assert file_path is not None
+        assert file_path == fake_pdf_on_disk
         assert file_path.exists()
 
-    @patch('subprocess.run')
-    def test_download_article_wget_failure(self, mock_run, temp_dir):
+    def test_download_article_wget_failure(self, temp_dir):
         """Test failed article download with wget."""
-        mock_run.return_value = Mock(returncode=1)
-
         success, file_path = download_article_wget(
             url="https://example.com/paper.pdf",
             output_dir=temp_dir,
@@ -6,13 +6,28 @@ import pytest
 from src.ingestion.chunker import chunk_documents
 
 
+@pytest.fixture(scope="module")
+def _chunk_cache():
+    """Module-wide store so identical chunking runs happen only once."""
+    return {}
+
+
+@pytest.fixture
+def chunked_100_20(sample_document, _chunk_cache):
+    """Sample document chunked with chunk_size=100, chunk_overlap=20 (computed once per module)."""
+    key = (sample_document.page_content, 100, 20)
+    if key not in _chunk_cache:
+        _chunk_cache[key] = chunk_documents([sample_document], chunk_size=100, chunk_overlap=20)
+    return _chunk_cache[key]
+
+
 @pytest.mark.unit
 class TestChunker:
     """Tests for document chunking."""
 
-    def test_chunk_single_document(self, sample_document):
+    def test_chunk_single_document(self, chunked_100_20):
         """Test chunking a single document."""
-        chunks = chunk_documents([sample_document], chunk_size=100, chunk_overlap=20)
+        chunks = chunked_100_20
 
         assert len(chunks) > 0
         assert all(isinstance(chunk.page_content, str) for chunk in chunks)
@@ -31,18 +46,19 @@ class TestChunker:
         chunks = chunk_documents([], chunk_size=100, chunk_overlap=20)
         assert chunks == []
 
-    def test_chunk_preserves_metadata(self, sample_document):
+    def test_chunk_preserves_metadata(self, sample_document, chunked_100_20):
         """Test that chunking preserves document metadata."""
-        chunks = chunk_documents([sample_document], chunk_size=100, chunk_overlap=20)
+        chunks = chunked_100_20
 
+        assert len(chunks) > 1
         for chunk in chunks:
             assert chunk.metadata["source"] == sample_document.metadata["source"]
             assert chunk.metadata["source_type"] == sample_document.metadata["source_type"]
 
-    def test_chunk_size_respected(self, sample_document):
+    def test_chunk_size_respected(self, chunked_100_20):
         """Test that chunk size is approximately respected."""
         chunk_size = 100
-        chunks = chunk_documents([sample_document], chunk_size=chunk_size, chunk_overlap=20)
+        chunks = chunked_100_20
 
         # Chunks should be around the specified size (with some tolerance)
         for chunk in chunks:
@@ -2,164 +2,243 @@
 Unit tests for PDF loading and extraction.
 """
 
+import functools
+import fitz
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 from pathlib import Path
 from src.ingestion.pdf_loader import (
+    TEXT_EXTRACTION_FLAGS,
+    clear_pdf_cache,
     extract_text_from_pdf_pymupdf,
     load_pdf_from_file,
     load_pdf_source
 )
 
+# Run this module on its own xdist worker (--dist loadgroup)
+pytestmark = pytest.mark.xdist_group(name="ingestion_pdf")
+
+_PDF_BYTES = b"%PDF-1.4 test content"
+
+# Shared HTTP response for download tests; only the attributes download_pdf uses
+_PDF_RESPONSE = SimpleNamespace(
+    status_code=200,
+    content=_PDF_BYTES,
+    raise_for_status=lambda: None,
+    iter_content=lambda chunk_size=1: [_PDF_BYTES],
+    close=lambda: None,
+)
+
+
+class FakePage:
+    """Minimal stand-in for fitz.Page returning fixed text."""
+
+    __slots__ = ("_text",)
+
+    def __init__(self, text):
+        self._text = text
+
+    def get_text(self, *args, **kwargs):
+        return self._text
+
+
+class FakeDoc:
+    """Minimal stand-in for fitz.Document exposing only what the loader uses."""
+
+    __slots__ = ("metadata", "_pages")
+
+    def __init__(self, pages, metadata=None):
+        self.metadata = metadata or {}
+        self._pages = pages
+
+    def __len__(self):
+        return len(self._pages)
+
+    def __getitem__(self, index):
+        return self._pages[index]
+
+    def close(self):
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_doc(texts, metadata_items):
+    return FakeDoc([FakePage(text) for text in texts], dict(metadata_items))
+
+
+def make_doc(texts, metadata=None):
+    """Return a prebuilt fake PDF document for the given page texts and metadata."""
+    return _cached_doc(tuple(texts), frozenset((metadata or {}).items()))
+
+
+def _extract():
+    return extract_text_from_pdf_pymupdf("/path/to/test.pdf")
+
+
+def _load():
+    doc = load_pdf_from_file("/path/to/test.pdf")
+    return doc.page_content, doc.metadata
+
+
+def _load_with_url():
+    doc = load_pdf_from_file("/path/to/test.pdf", source_url="https://example.com/test.pdf")
+    return doc.page_content, doc.metadata
+
+
+@pytest.fixture(scope="module")
+def _fitz_open():
+    """Patch fitz.open once for the whole module."""
+    with patch('fitz.open') as mock_open:
+        yield mock_open
+
+
+@pytest.fixture(autouse=True)
+def _empty_pdf_cache():
+    """Start every test with an empty parsed-PDF cache."""
+    clear_pdf_cache()
+    yield
+    clear_pdf_cache()
+
+
+@pytest.fixture
+def fitz_mock(_fitz_open):
+    """Module-wide fitz.open mock, reset before each test."""
+    _fitz_open.reset_mock(return_value=True, side_effect=True)
+    return _fitz_open
+
 
 @pytest.mark.unit
 class TestPDFLoader:
     """Tests for PDF loading functionality."""
 
-    @patch('fitz.open')
-    def test_extract_text_from_pdf_pymupdf(self, mock_fitz_open):
-        """Test PyMuPDF text extraction."""
-        # Mock PDF document
-        mock_doc = MagicMock()
-        mock_doc.metadata = {"title": "Test PDF", "author": "Test Author"}
-        mock_doc.__len__.return_value = 2
-
-        # Mock pages
-        mock_page1 = MagicMock()
-        mock_page1.get_text.return_value = "This is page 1 content."
-        mock_page2 = MagicMock()
-        mock_page2.get_text.return_value = "This is page 2 content."
-
-        mock_doc.__getitem__.side_effect = [mock_page1, mock_page2]
-        mock_fitz_open.return_value = mock_doc
-
-        text, metadata = extract_text_from_pdf_pymupdf("test.pdf")
-
-        assert "page 1 content" in text
-        assert "page 2 content" in text
-        assert metadata["num_pages"] == 2
-        assert metadata["title"] == "Test PDF"
-        assert metadata["author"] == "Test Author"
-
-    @patch('fitz.open')
-    def test_extract_text_from_empty_pdf(self, mock_fitz_open):
-        """Test handling of empty PDF."""
-        mock_doc = MagicMock()
-        mock_doc.metadata = {}
-        mock_doc.__len__.return_value = 0
-        mock_fitz_open.return_value = mock_doc
-
-        text, metadata = extract_text_from_pdf_pymupdf("empty.pdf")
-
-        assert text == ""
-        assert metadata["num_pages"] == 0
-
-    @patch('fitz.open')
-    def test_load_pdf_from_file(self, mock_fitz_open):
-        """Test loading PDF from local file."""
-        mock_doc = MagicMock()
-        mock_doc.metadata = {"title": "Test PDF"}
-        mock_doc.__len__.return_value = 1
-
-        mock_page = MagicMock()
-        mock_page.get_text.return_value = "PDF content here"
-        mock_doc.__getitem__.return_value = mock_page
-        mock_fitz_open.return_value = mock_doc
-
-        doc = load_pdf_from_file("/path/to/test.pdf", source_url="https://example.com/test.pdf")
-
-        assert doc is not None
-        assert "PDF content" in doc.page_content
-        assert doc.metadata["source"] == "https://example.com/test.pdf"
-        assert doc.metadata["source_type"] == "pdf"
-        assert doc.metadata["num_pages"] == 1
-
-    @patch('fitz.open')
-    def test_load_pdf_from_file_without_url(self, mock_fitz_open):
-        """Test loading PDF without source URL."""
-        mock_doc = MagicMock()
-        mock_doc.metadata = {}
-        mock_doc.__len__.return_value = 1
-
-        mock_page = MagicMock()
-        mock_page.get_text.return_value = "Content"
-        mock_doc.__getitem__.return_value = mock_page
-        mock_fitz_open.return_value = mock_doc
-
-        doc = load_pdf_from_file("/path/to/test.pdf")
-
-        assert doc.metadata["source"] == "/path/to/test.pdf"
-
-    @patch('fitz.open')
-    def test_pdf_extraction_preserves_structure(self, mock_fitz_open):
-        """Test that PDF extraction preserves page structure."""
-        mock_doc = MagicMock()
-        mock_doc.metadata = {}
-        mock_doc.__len__.return_value = 2
-
-        mock_page1 = MagicMock()
-        mock_page1.get_text.return_value = "First page"
-        mock_page2 = MagicMock()
-        mock_page2.get_text.return_value = "Second page"
-
-        mock_doc.__getitem__.side_effect = [mock_page1, mock_page2]
-        mock_fitz_open.return_value = mock_doc
-
-        text, _ = extract_text_from_pdf_pymupdf("test.pdf")
-
-        assert "--- Page 1 ---" in text
-        assert "--- Page 2 ---" in text
-        assert text.index("First page") < text.index("Second page")
-
-    @patch('requests.get')
-    @patch('fitz.open')
-    def test_load_pdf_source_with_download(self, mock_fitz_open, mock_get):
+    @pytest.mark.parametrize(
+        "reader,pages,metadata,expected_substrings,expected_meta",
+        [
+            (
+                _extract,
+                ["This is page 1 content.", "This is page 2 content."],
+                {"title": "Test PDF", "author": "Test Author"},
+                ["page 1 content", "page 2 content"],
+                {"num_pages": 2, "title": "Test PDF", "author": "Test Author"},
+            ),
+            (_extract, [], {}, [], {"num_pages": 0}),
+            (
+                _load_with_url,
+                ["PDF content here"],
+                {"title": "Test PDF"},
+                ["PDF content"],
+                {"source": "https://example.com/test.pdf", "source_type": "pdf", "num_pages": 1},
+            ),
+            (_load, ["Content"], {}, ["Content"], {"source": "/path/to/test.pdf"}),
+            (
+                _extract,
+                ["First page", "Second page"],
+                {},
+                ["--- Page 1 ---", "First page", "--- Page 2 ---", "Second page"],
+                {"num_pages": 2},
+            ),
+            (_load, ["Content with €, ñ, and 中文"], {}, frozenset("€ñ中文"), {}),
+        ],
+        ids=[
+            "pymupdf-metadata",
+            "empty-pdf",
+            "load-from-file",
+            "load-without-url",
+            "preserves-page-structure",
+            "special-characters",
+        ],
+    )
+    def test_extract(self, fitz_mock, reader, pages, metadata, expected_substrings, expected_meta):
+        """Test PDF text and metadata extraction across document shapes."""
+        fitz_mock.return_value = make_doc(pages, metadata)
+
+        text, result_meta = reader()
+
+        if not pages:
+            assert text == ""
+        if isinstance(expected_substrings, frozenset):
+            # Unordered character set: every character must occur somewhere
+            assert not expected_substrings - set(text)
+        else:
+            # Expected substrings must appear in the given order
+            position = 0
+            for substring in expected_substrings:
+                assert substring in text[position:]
+                position = text.index(substring, position) + len(substring)
+        assert expected_meta.items() <= result_meta.items()
+
+    @pytest.mark.parametrize("num_pages", [10, 50, 200])
+    def test_extract_text_from_pdf_pymupdf_large(self, fitz_mock, num_pages):
+        """Test extraction keeps every page of larger documents in order."""
+        fitz_mock.return_value = make_doc([f"Body of page {i}" for i in range(1, num_pages + 1)])
+
+        text, metadata = _extract()
+
+        assert metadata["num_pages"] == num_pages
+        assert text.count("--- Page ") == num_pages
+        assert text.index(f"--- Page {num_pages} ---") > text.index("--- Page 1 ---")
+        assert text.endswith(f"Body of page {num_pages}")
+
+    def test_get_text_called_with_default_text_flags(self, fitz_mock):
+        """Test that pages are extracted in plain-text mode with PyMuPDF's default flags."""
+        page = Mock()
+        page.get_text.return_value = "Flagged page"
+        fitz_mock.return_value = FakeDoc([page])
+
+        _extract()
+
+        page.get_text.assert_called_once_with("text", flags=TEXT_EXTRACTION_FLAGS)
+        assert TEXT_EXTRACTION_FLAGS == fitz.TEXTFLAGS_TEXT
+
+    def test_load_pdf_cached(self, fitz_mock, temp_dir):
+        """Test that repeated loads of an unchanged file parse it only once."""
+        pdf_path = temp_dir / "cached.pdf"
+        pdf_path.write_bytes(_PDF_BYTES)
+        fitz_mock.return_value = make_doc(["Cached PDF content"])
+
+        first = load_pdf_from_file(str(pdf_path))
+        second = load_pdf_from_file(str(pdf_path))
+
+        assert fitz_mock.call_count == 1
+        assert first.page_content == second.page_content
+        assert first is not second
+
+        clear_pdf_cache()
+        load_pdf_from_file(str(pdf_path))
+        assert fitz_mock.call_count == 2
+
+    @patch('src.ingestion.pdf_loader._SESSION.get')
+    def test_load_pdf_source_with_download(self, mock_get, fitz_mock):
         """Test loading PDF from URL with download."""
-        # Mock HTTP response with iterable iter_content
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b"%PDF-1.4 test content"
-        # Make iter_content return an iterable of chunks
-        mock_response.iter_content = Mock(return_value=[b"%PDF-1.4 ", b"test ", b"content"])
-        mock_get.return_value = mock_response
+        mock_get.return_value = _PDF_RESPONSE
 
         # Mock PDF extraction
-        mock_doc = MagicMock()
-        mock_doc.metadata = {}
-        mock_doc.__len__.return_value = 1
-        mock_page = MagicMock()
-        mock_page.get_text.return_value = "Downloaded PDF content"
-        mock_doc.__getitem__.return_value = mock_page
-        mock_fitz_open.return_value = mock_doc
+        fitz_mock.return_value = make_doc(["Downloaded PDF content"])
 
         doc = load_pdf_source("https://example.com/paper.pdf")
 
         assert doc is not None
         assert "Downloaded PDF content" in doc.page_content
+        assert doc.metadata["source"] == "https://example.com/paper.pdf"
         mock_get.assert_called_once()
+        fitz_mock.assert_called_once_with(stream=_PDF_BYTES, filetype="pdf")
+
+    @patch('tempfile.NamedTemporaryFile')
+    @patch('src.ingestion.pdf_loader._SESSION.get')
+    def test_load_pdf_source_no_tempfile(self, mock_get, mock_tempfile, fitz_mock):
+        """Test that URL loading parses in memory without a temporary file."""
+        mock_get.return_value = _PDF_RESPONSE
+        fitz_mock.return_value = make_doc(["Downloaded PDF content"])
+
+        load_pdf_source("https://example.com/paper.pdf")
 
-    @patch('requests.get')
+        mock_tempfile.assert_not_called()
+
+    @patch('src.ingestion.pdf_loader._SESSION.get')
     def test_load_pdf_source_download_failure(self, mock_get):
         """Test handling of failed PDF download."""
         mock_get.side_effect = Exception("Connection error")
 
         with pytest.raises(Exception):
             load_pdf_source("https://example.com/paper.pdf")
-
-    @patch('fitz.open')
-    def test_load_pdf_with_special_characters(self, mock_fitz_open):
-        """Test loading PDF with special characters in text."""
-        mock_doc = MagicMock()
-        mock_doc.metadata = {}
-        mock_doc.__len__.return_value = 1
-
-        mock_page = MagicMock()
-        mock_page.get_text.return_value = "Content with €, ñ, and 中文"
-        mock_doc.__getitem__.return_value = mock_page
-        mock_fitz_open.return_value = mock_doc
-
-        doc = load_pdf_from_file("test.pdf")
-
-        assert "€" in doc.page_content
-        assert "ñ" in doc.page_content
-        assert "中文" in doc.page_content
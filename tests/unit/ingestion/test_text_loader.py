@@ -5,6 +5,15 @@ Unit tests for text file loading.
 import pytest
 from src.ingestion.text_loader import load_text_file
 
+# Run this module on its own xdist worker (--dist loadgroup)
+pytestmark = pytest.mark.xdist_group(name="ingestion_text")
+
+
+@pytest.fixture(scope="module")
+def text_temp_dir(tmp_path_factory):
+    """One temporary directory shared by the module; tests use unique filenames."""
+    return tmp_path_factory.mktemp("text_loader")
+
 
 @pytest.mark.unit
 class TestTextLoader:
@@ -20,9 +29,9 @@ class TestTextLoader:
         assert doc.metadata["source_type"] == "article"
         assert doc.metadata["title"] == "Sample Article"
 
-    def test_load_text_file_no_title(self, temp_dir):
+    def test_load_text_file_no_title(self, text_temp_dir):
         """Test loading text file without title metadata."""
-        file_path = temp_dir / "no_title.txt"
+        file_path = text_temp_dir / "no_title.txt"
         file_path.write_text("Just some content without metadata.")
 
         doc = load_text_file(str(file_path))
@@ -36,18 +45,18 @@ class TestTextLoader:
         with pytest.raises(Exception):
             load_text_file("/nonexistent/path/file.txt")
 
-    def test_load_empty_file(self, temp_dir):
+    def test_load_empty_file(self, text_temp_dir):
         """Test loading empty file raises error."""
-        file_path = temp_dir / "empty.txt"
+        file_path = text_temp_dir / "empty.txt"
         file_path.write_text("")
 
         with pytest.raises(ValueError):
             load_text_file(str(file_path))
 
-    def test_load_preserves_content(self, temp_dir):
+    def test_load_preserves_content(self, text_temp_dir):
         """Test that loading preserves file content."""
         content = "Line 1\nLine 2\nLine 3"
-        file_path = temp_dir / "test.txt"
+        file_path = text_temp_dir / "preserves_content.txt"
         file_path.write_text(content)
 
         doc = load_text_file(str(file_path))
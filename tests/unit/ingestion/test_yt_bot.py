@@ -3,37 +3,69 @@ Unit tests for YouTube transcript extraction.
 """
 
 import pytest
-from unittest.mock import Mock, patch
 from src.ingestion.yt_bot import get_video_id, process, load_youtube_video
 
+# Run this module on its own xdist worker (--dist loadgroup)
+pytestmark = pytest.mark.xdist_group(name="ingestion_yt")
+
+VIDEO_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class FakeTranscript:
+    """Stand-in for a youtube_transcript_api Transcript."""
+
+    def __init__(self, data):
+        self._data = data
+
+    def fetch(self):
+        return self._data
+
+
+class FakeTranscriptList:
+    """Stand-in for a TranscriptList holding one manually created transcript."""
+
+    def __init__(self, transcript):
+        self._transcript = transcript
+
+    def find_manually_created_transcript(self, language_codes=None):
+        return self._transcript
+
+
+class FakeTranscriptApi:
+    """YouTubeTranscriptApi replacement serving a fixed transcript."""
+
+    def __init__(self, data):
+        self._transcripts = FakeTranscriptList(FakeTranscript(data))
+
+    def list_transcripts(self, video_id):
+        return self._transcripts
+
+
+class FailingTranscriptApi:
+    """YouTubeTranscriptApi replacement for videos without transcripts."""
+
+    @staticmethod
+    def list_transcripts(video_id):
+        raise Exception("No transcript available")
+
 
 @pytest.mark.unit
 class TestYouTubeBot:
     """Tests for YouTube transcript functionality."""
 
-    def test_get_video_id_standard_format(self):
-        """Test extracting video ID from standard YouTube URL."""
-        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-        video_id = get_video_id(url)
-        assert video_id == "dQw4w9WgXcQ"
-
-    def test_get_video_id_short_format(self):
-        """Test extracting video ID from short YouTube URL."""
-        url = "https://youtu.be/dQw4w9WgXcQ"
-        video_id = get_video_id(url)
-        assert video_id == "dQw4w9WgXcQ"
-
-    def test_get_video_id_embed_format(self):
-        """Test extracting video ID from embed URL."""
-        url = "https://www.youtube.com/embed/dQw4w9WgXcQ"
-        video_id = get_video_id(url)
-        assert video_id == "dQw4w9WgXcQ"
-
-    def test_get_video_id_invalid_url(self):
-        """Test handling invalid YouTube URL."""
-        url = "https://example.com/not-youtube"
-        video_id = get_video_id(url)
-        assert video_id is None
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://www.youtube.com/embed/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://example.com/not-youtube", None),
+        ],
+        ids=["standard", "short", "embed", "invalid"],
+    )
+    def test_get_video_id(self, url, expected):
+        """Test extracting video ID from supported YouTube URL formats."""
+        assert get_video_id(url) == expected
 
     def test_process_transcript(self, mock_youtube_transcript):
         """Test processing transcript into formatted string."""
@@ -46,6 +78,27 @@ class TestYouTubeBot:
         assert "[00:02]" in result
         assert "Today we'll discuss AI" in result
 
+    def test_process_does_not_mutate(self, mock_youtube_transcript):
+        """Test that processing leaves the transcript segments untouched."""
+        before = [dict(segment) for segment in mock_youtube_transcript]
+
+        process(mock_youtube_transcript)
+
+        assert [dict(segment) for segment in mock_youtube_transcript] == before
+
+    def test_process_long_transcript(self):
+        """Test that every segment of a long transcript becomes one line, in order."""
+        transcript = [
+            {"text": f"Segment {i}", "start": float(i), "duration": 1.0}
+            for i in range(10_000)
+        ]
+
+        lines = process(transcript).split("\n")
+
+        assert len(lines) == len(transcript)
+        assert lines[0] == "[00:00] Segment 0"
+        assert lines[-1] == "[166:39] Segment 9999"
+
     def test_process_empty_transcript(self):
         """Test processing empty transcript."""
         result = process([])
@@ -64,38 +117,27 @@ class TestYouTubeBot:
         assert "Good segment" in result
         assert "Another good one" in result
 
-    @patch('src.ingestion.yt_bot.get_video_id')
-    @patch('src.ingestion.yt_bot.YouTubeTranscriptApi')
-    def test_load_youtube_video_success(self, mock_api, mock_get_video_id, mock_youtube_transcript):
+    def test_load_youtube_video_success(self, monkeypatch, mock_youtube_transcript):
         """Test successfully loading a YouTube video."""
-        # Mock video ID extraction (YouTube IDs are 11 chars, but test uses "test123")
-        mock_get_video_id.return_value = "test123"
+        monkeypatch.setattr(
+            'src.ingestion.yt_bot.YouTubeTranscriptApi',
+            FakeTranscriptApi(mock_youtube_transcript)
+        )
 
-        # Mock the API
-        mock_transcript_list = Mock()
-        mock_transcript = Mock()
-        mock_transcript.fetch.return_value = mock_youtube_transcript
-        mock_transcript_list.find_manually_created_transcript.return_value = mock_transcript
-        mock_api.list_transcripts.return_value = mock_transcript_list
-
-        url = "https://www.youtube.com/watch?v=test123"
-        doc = load_youtube_video(url)
+        doc = load_youtube_video(VIDEO_URL)
 
         assert doc is not None
         assert len(doc.page_content) > 0
-        assert doc.metadata["source"] == url
+        assert doc.metadata["source"] == VIDEO_URL
         assert doc.metadata["source_type"] == "youtube"
-        assert doc.metadata["video_id"] == "test123"
+        assert doc.metadata["video_id"] == "dQw4w9WgXcQ"
 
-    @patch('src.ingestion.yt_bot.YouTubeTranscriptApi')
-    def test_load_youtube_video_no_transcript(self, mock_api):
+    def test_load_youtube_video_no_transcript(self, monkeypatch):
         """Test handling video with no transcript."""
-        mock_api.list_transcripts.side_effect = Exception("No transcript available")
-
-        url = "https://www.youtube.com/watch?v=test123"
+        monkeypatch.setattr('src.ingestion.yt_bot.YouTubeTranscriptApi', FailingTranscriptApi)
 
         with pytest.raises(Exception):
-            load_youtube_video(url)
+            load_youtube_video(VIDEO_URL)
 
     def test_load_youtube_video_invalid_url(self):
         """Test handling invalid YouTube URL."""
@@ -2,25 +2,44 @@
 Unit tests for cost tracking functionality.
 """
 
+import json
 import pytest
-from src.utils.cost_tracker import CostTracker
+from src.utils.cost_tracker import CostTracker, IN_MEMORY_LOG
+
+# Run this module on its own xdist worker (--dist loadgroup)
+pytestmark = pytest.mark.xdist_group(name="cost_tracker")
+
+
+@pytest.fixture(scope="class")
+def _class_tracker():
+    """One in-memory CostTracker shared by every test in a class."""
+    return CostTracker(log_file=IN_MEMORY_LOG)
+
+
+@pytest.fixture
+def cost_log_path(tmp_path):
+    """Path string for a disk-backed cost log file."""
+    return str(tmp_path / "test_costs.json")
+
+
+@pytest.fixture
+def tracker(_class_tracker):
+    """Shared CostTracker with its session state and in-memory log reset for each test."""
+    _class_tracker.reset()
+    return _class_tracker
 
 
 @pytest.mark.unit
 class TestCostTracker:
     """Tests for API cost tracking."""
 
-    def test_initialization(self, temp_dir):
+    def test_initialization(self, tracker):
         """Test initializing cost tracker."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         assert len(tracker.session_calls) == 0
         assert tracker.log_file.exists() or not tracker.log_file.exists()
 
-    def test_track_openai_call_gpt4o_mini(self, temp_dir):
+    def test_track_openai_call_gpt4o_mini(self, tracker):
         """Test tracking GPT-4o-mini API call."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost = tracker.track_openai_call(
             model="gpt-4o-mini",
             input_tokens=100,
@@ -33,10 +52,8 @@ class TestCostTracker:
         assert tracker.session_calls[0].model == "gpt-4o-mini"
         assert tracker.session_calls[0].operation == "generation"
 
-    def test_track_openai_call_gpt4o(self, temp_dir):
+    def test_track_openai_call_gpt4o(self, tracker):
         """Test tracking GPT-4o API call."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost = tracker.track_openai_call(
             model="gpt-4o",
             input_tokens=100,
@@ -46,10 +63,8 @@ class TestCostTracker:
 
         assert cost > 0
 
-    def test_track_embedding_call(self, temp_dir):
+    def test_track_embedding_call(self, tracker):
         """Test tracking embedding API call."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost = tracker.track_embedding_call(
             model="text-embedding-3-small",
             tokens=1000,
@@ -59,10 +74,8 @@ class TestCostTracker:
         assert cost > 0
         assert len(tracker.session_calls) == 1
 
-    def test_track_tavily_search(self, temp_dir):
+    def test_track_tavily_search(self, tracker):
         """Test tracking Tavily search cost."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost = tracker.track_tavily_search(
             search_depth="advanced",
             num_results=10
@@ -72,10 +85,8 @@ class TestCostTracker:
         assert len(tracker.session_calls) == 1
         assert tracker.session_calls[0].provider == "tavily"
 
-    def test_multiple_calls_accumulate(self, temp_dir):
+    def test_multiple_calls_accumulate(self, tracker):
         """Test that multiple calls accumulate correctly."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost1 = tracker.track_openai_call(
             model="gpt-4o-mini",
             input_tokens=100,
@@ -94,10 +105,8 @@ class TestCostTracker:
         assert session_costs['total'] == cost1 + cost2
         assert len(tracker.session_calls) == 2
 
-    def test_get_session_costs(self, temp_dir):
+    def test_get_session_costs(self, tracker):
         """Test getting session cost summary."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         tracker.track_openai_call(
             model="gpt-4o-mini",
             input_tokens=100,
@@ -108,15 +117,11 @@ class TestCostTracker:
 
         costs = tracker.get_session_costs()
 
-        assert "total" in costs
-        assert "by_provider" in costs
-        assert "by_model" in costs
+        assert {"total", "by_provider", "by_model"} <= costs.keys()
         assert costs['total'] > 0
 
-    def test_get_session_costs_structure(self, temp_dir):
+    def test_get_session_costs_structure(self, tracker):
         """Test session costs structure."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         tracker.track_openai_call(
             model="gpt-4o-mini",
             input_tokens=100,
@@ -129,10 +134,8 @@ class TestCostTracker:
         assert isinstance(costs, dict)
         assert costs['total'] > 0
 
-    def test_zero_tokens_handling(self, temp_dir):
+    def test_zero_tokens_handling(self, tracker):
         """Test handling of zero tokens."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost = tracker.track_openai_call(
             model="gpt-4o-mini",
             input_tokens=0,
@@ -142,10 +145,8 @@ class TestCostTracker:
 
         assert cost == 0.0
 
-    def test_call_logging(self, temp_dir):
+    def test_call_logging(self, tracker):
         """Test that calls are logged to session."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         tracker.track_openai_call(
             model="gpt-4o-mini",
             input_tokens=100,
@@ -162,10 +163,8 @@ class TestCostTracker:
         assert call.output_tokens == 50
         assert call.cost > 0
 
-    def test_metadata_tracking(self, temp_dir):
+    def test_metadata_tracking(self, tracker):
         """Test metadata is tracked with API calls."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         metadata = {"query": "test query", "context_length": 1000}
         tracker.track_openai_call(
             model="gpt-4o-mini",
@@ -177,10 +176,8 @@ class TestCostTracker:
 
         assert tracker.session_calls[0].metadata == metadata
 
-    def test_cost_precision(self, temp_dir):
+    def test_cost_precision(self, tracker):
         """Test that costs are calculated with appropriate precision."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost = tracker.track_openai_call(
             model="gpt-4o-mini",
             input_tokens=1,
@@ -192,10 +189,8 @@ class TestCostTracker:
         assert cost > 0
         assert cost < 0.01  # Less than a cent
 
-    def test_large_token_counts(self, temp_dir):
+    def test_large_token_counts(self, tracker):
         """Test handling of large token counts."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost = tracker.track_openai_call(
             model="gpt-4o-mini",
             input_tokens=100000,
@@ -207,10 +202,8 @@ class TestCostTracker:
         costs = tracker.get_session_costs()
         assert costs['total'] == cost
 
-    def test_basic_search_cost(self, temp_dir):
+    def test_basic_search_cost(self, tracker):
         """Test Tavily basic search cost tracking."""
-        tracker = CostTracker(log_file=str(temp_dir / "test_costs.json"))
-
         cost = tracker.track_tavily_search(
             search_depth="basic",
             num_results=5
@@ -218,3 +211,41 @@ class TestCostTracker:
 
         assert cost > 0
         assert len(tracker.session_calls) == 1
+
+    def test_in_memory_log_totals(self, tracker):
+        """Test that in-memory logs feed get_total_costs without a file."""
+        cost = tracker.track_tavily_search(search_depth="basic")
+
+        totals = tracker.get_total_costs()
+
+        assert tracker.in_memory is True
+        assert not tracker.log_file.exists()
+        assert totals["num_calls"] == 1
+        assert totals["total"] == cost
+        assert totals["by_provider"] == {"tavily": cost}
+
+    def test_reset_clears_in_memory_log(self, tracker):
+        """Test that reset() empties both the session and the in-memory log."""
+        tracker.track_tavily_search(search_depth="basic")
+
+        tracker.reset()
+
+        assert tracker.session_calls == []
+        assert tracker.get_total_costs()["num_calls"] == 0
+
+    def test_log_file_persistence(self, cost_log_path):
+        """Test that calls are persisted to a disk-backed log file."""
+        disk_tracker = CostTracker(log_file=cost_log_path)
+
+        cost = disk_tracker.track_openai_call(
+            model="gpt-4o-mini",
+            input_tokens=100,
+            output_tokens=50,
+            operation="generation"
+        )
+
+        with open(cost_log_path) as f:
+            logs = json.load(f)
+        assert len(logs) == 1
+        assert logs[0]["model"] == "gpt-4o-mini"
+        assert disk_tracker.get_total_costs()["total"] == cost
@@ -0,0 +1,18 @@
+"""
+Shared fixtures for vector store tests.
+"""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def fake_vec_1536():
+    """Shared 1536-d float32 embedding for tests that don't inspect its values."""
+    return np.zeros(1536, dtype=np.float32)
+
+
+@pytest.fixture(scope="module")
+def fake_vec_1536_list(fake_vec_1536):
+    """The shared embedding as a list of floats, as in API responses."""
+    return fake_vec_1536.tolist()
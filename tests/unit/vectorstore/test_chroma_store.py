@@ -2,10 +2,17 @@
 Unit tests for ChromaDB vector store.
 """
 
+import math
+import threading
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch
 from langchain_core.documents import Document
-from src.vectorstore.chroma_store import ChromaVectorStore
+from src.vectorstore.chroma_store import (
+    ChromaVectorStore,
+    _shard_for,
+    _sanitize_metadata
+)
 
 
 @pytest.mark.unit
@@ -33,7 +40,7 @@ class TestChromaVectorStore:
         mock_chroma_client.assert_called_once()
 
     @patch('chromadb.PersistentClient')
-    def test_add_documents(self, mock_chroma_client, sample_documents, temp_dir):
+    def test_add_documents(self, mock_chroma_client, sample_documents, temp_dir, fake_vec_1536):
         """Test adding documents to vector store."""
         mock_collection = Mock()
         mock_collection.count.return_value = 0
@@ -42,7 +49,7 @@ class TestChromaVectorStore:
         mock_chroma_client.return_value = mock_client_instance
 
         mock_embedding_model = Mock()
-        mock_embedding_model.embed_documents.return_value = [[0.1] * 1536, [0.2] * 1536]
+        mock_embedding_model.embed_documents.return_value = [fake_vec_1536, fake_vec_1536]
 
         store = ChromaVectorStore(
             persist_directory=str(temp_dir),
@@ -52,7 +59,169 @@ class TestChromaVectorStore:
 
         store.add_documents(sample_documents)
 
-        mock_collection.add.assert_called_once()
+        expected_batches = math.ceil(len(sample_documents) / store.batch_size)
+        assert mock_collection.add.call_count == expected_batches
+
+    @patch('chromadb.PersistentClient')
+    def test_add_documents_in_batches(self, mock_chroma_client, temp_dir, fake_vec_1536):
+        """Test that documents are embedded and added one batch at a time."""
+        mock_collection = Mock()
+        mock_collection.count.return_value = 0
+        mock_client_instance = Mock()
+        mock_client_instance.get_or_create_collection.return_value = mock_collection
+        mock_chroma_client.return_value = mock_client_instance
+
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_documents.side_effect = (
+            lambda texts: [fake_vec_1536] * len(texts)
+        )
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir),
+            collection_name="test",
+            embedding_model=mock_embedding_model,
+            batch_size=2
+        )
+
+        docs = [Document(page_content=f"Chunk {i}", metadata={"i": i}) for i in range(5)]
+        returned_ids = store.add_documents(docs)
+
+        assert mock_collection.add.call_count == 3
+        assert mock_embedding_model.embed_documents.call_count == 3
+        added_ids = [
+            doc_id
+            for call in mock_collection.add.call_args_list
+            for doc_id in call.kwargs["ids"]
+        ]
+        assert added_ids == returned_ids
+        assert len(set(added_ids)) == 5
+
+    @patch('chromadb.PersistentClient')
+    def test_failed_batch_rolls_back_earlier_batches(self, mock_chroma_client, temp_dir):
+        """Test that a failed write deletes the batches already written by the call."""
+        mock_collection = Mock()
+        mock_collection.count.return_value = 0
+        mock_collection.add.side_effect = [None, RuntimeError("disk full")]
+        mock_chroma_client.return_value.get_or_create_collection.return_value = mock_collection
+
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_documents.side_effect = (
+            lambda texts: [[0.1] * 8 for _ in texts]
+        )
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir),
+            collection_name="test",
+            embedding_model=mock_embedding_model,
+            batch_size=2
+        )
+
+        docs = [Document(page_content=f"Chunk {i}", metadata={"i": i}) for i in range(4)]
+        with pytest.raises(RuntimeError, match="disk full"):
+            store.add_documents(docs)
+
+        first_batch_ids = mock_collection.add.call_args_list[0].kwargs["ids"]
+        mock_collection.delete.assert_called_once_with(ids=first_batch_ids)
+
+        # The cached count is dropped, so stats recount the collection
+        assert store.get_collection_stats()["total_documents"] == 0
+        assert mock_collection.count.call_count == 2
+
+    @patch('chromadb.PersistentClient')
+    def test_add_documents_embeds_batches_concurrently(self, mock_chroma_client, temp_dir):
+        """Test that batches are embedded in parallel but written in order."""
+        mock_collection = Mock()
+        mock_collection.count.return_value = 0
+        mock_chroma_client.return_value.get_or_create_collection.return_value = mock_collection
+
+        # Every embed call waits at the barrier until all eight are in flight,
+        # so the add only completes if the batches really overlap
+        barrier = threading.Barrier(8, timeout=5)
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def blocking_embed(texts):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            barrier.wait()
+            with lock:
+                in_flight -= 1
+            return [[0.1] * 8 for _ in texts]
+
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_documents.side_effect = blocking_embed
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir),
+            collection_name="test",
+            embedding_model=mock_embedding_model,
+            batch_size=1,
+            embed_workers=8
+        )
+
+        docs = [Document(page_content=f"Chunk {i}", metadata={"i": i}) for i in range(8)]
+        store.add_documents(docs)
+
+        assert peak == 8
+        written = [call.kwargs["documents"][0] for call in mock_collection.add.call_args_list]
+        assert written == [doc.page_content for doc in docs]
+        assert store.get_collection_stats()["total_documents"] == 8
+
+    @patch('chromadb.PersistentClient')
+    def test_sharded_add_and_search(self, mock_chroma_client, temp_dir):
+        """Test that a sharded store routes writes by ID and merges shard results."""
+        shards = {}
+
+        def get_or_create_collection(name, metadata):
+            shard = Mock()
+            shard.count.return_value = 0
+            shards[name] = shard
+            return shard
+
+        mock_client_instance = mock_chroma_client.return_value
+        mock_client_instance.get_or_create_collection.side_effect = get_or_create_collection
+
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_documents.side_effect = (
+            lambda texts: np.arange(len(texts) * 4, dtype=np.float32).reshape(-1, 4)
+        )
+        mock_embedding_model.embed_query.return_value = [0.5] * 4
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir),
+            collection_name="test",
+            embedding_model=mock_embedding_model,
+            num_shards=4
+        )
+
+        docs = [Document(page_content=f"Chunk {i}", metadata={"i": i}) for i in range(8)]
+        ids = store.add_documents(docs)
+
+        assert list(shards) == [f"test__shard{i}" for i in range(4)]
+        written = {}
+        for i, shard in enumerate(shards.values()):
+            for call in shard.add.call_args_list:
+                shard_ids = call.kwargs["ids"]
+                assert all(_shard_for(doc_id, 4) == i for doc_id in shard_ids)
+                assert call.kwargs["embeddings"].shape == (len(shard_ids), 4)
+                written.update(zip(shard_ids, call.kwargs["documents"]))
+        assert written == {doc_id: doc.page_content for doc_id, doc in zip(ids, docs)}
+
+        for i, shard in enumerate(shards.values()):
+            shard.query.return_value = {
+                'ids': [[f"doc_{i}"]],
+                'documents': [[f"Shard {i} result"]],
+                'metadatas': [[{'shard': i}]],
+                'distances': [[0.4 - i * 0.1]]
+            }
+
+        results = store.similarity_search("test query", k=2)
+
+        assert [doc.page_content for doc, _ in results] == ['Shard 3 result', 'Shard 2 result']
+        assert [score for _, score in results] == pytest.approx([0.9, 0.8])
+        assert all(shard.query.call_count == 1 for shard in shards.values())
 
     @patch('chromadb.PersistentClient')
     def test_add_empty_documents(self, mock_chroma_client, temp_dir):
@@ -76,7 +245,7 @@ class TestChromaVectorStore:
         mock_collection.add.assert_not_called()
 
     @patch('chromadb.PersistentClient')
-    def test_similarity_search(self, mock_chroma_client, temp_dir):
+    def test_similarity_search(self, mock_chroma_client, temp_dir, fake_vec_1536):
         """Test similarity search."""
         mock_collection = Mock()
         mock_collection.count.return_value = 2
@@ -92,7 +261,7 @@ class TestChromaVectorStore:
         mock_chroma_client.return_value = mock_client_instance
 
         mock_embedding_model = Mock()
-        mock_embedding_model.embed_query.return_value = [0.5] * 1536
+        mock_embedding_model.embed_query.return_value = fake_vec_1536
 
         store = ChromaVectorStore(
             persist_directory=str(temp_dir),
@@ -107,9 +276,112 @@ class TestChromaVectorStore:
         assert all(isinstance(result, tuple) for result in results)
         assert all(isinstance(result[0], Document) for result in results)
         assert all(isinstance(result[1], float) for result in results)
+        assert [score for _, score in results] == pytest.approx([0.9, 0.8])
+        assert [doc.page_content for doc, _ in results] == ['First result', 'Second result']
 
     @patch('chromadb.PersistentClient')
-    def test_similarity_search_with_score(self, mock_chroma_client, temp_dir):
+    def test_similarity_search_memory_backend(self, mock_chroma_client, temp_dir):
+        """Test similarity search against the in-memory NumPy backend."""
+        vectors = {
+            "First result": [1.0, 0.0, 0.0],
+            "Second result": [0.6, 0.8, 0.0],
+            "Unrelated": [0.0, 0.0, 1.0],
+        }
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_documents.side_effect = (
+            lambda texts: np.array([vectors[text] for text in texts], dtype=np.float32)
+        )
+        mock_embedding_model.embed_query.return_value = [2.0, 0.0, 0.0]
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir / "unused"),
+            collection_name="test",
+            embedding_model=mock_embedding_model,
+            batch_size=2,
+            backend="memory"
+        )
+        ids = store.add_documents([
+            Document(page_content=text, metadata={"source": f"url{i}"})
+            for i, text in enumerate(vectors, 1)
+        ])
+
+        results = store.similarity_search("test query", k=2)
+
+        mock_chroma_client.assert_not_called()
+        assert not (temp_dir / "unused").exists()
+        assert len(results) == 2
+        assert all(isinstance(result[0], Document) for result in results)
+        assert all(isinstance(result[1], float) for result in results)
+        assert [score for _, score in results] == pytest.approx([1.0, 0.6])
+        assert [doc.page_content for doc, _ in results] == ['First result', 'Second result']
+
+        filtered = store.similarity_search("test query", k=5, filter={"source": "url3"})
+        assert [doc.page_content for doc, _ in filtered] == ['Unrelated']
+
+        store.truncate(ids=ids[:1])
+        remaining = store.similarity_search("test query", k=5)
+        assert [doc.page_content for doc, _ in remaining] == ['Second result', 'Unrelated']
+
+        store.clear_collection()
+        assert store.similarity_search("test query", k=2) == []
+        assert store.get_collection_stats()["total_documents"] == 0
+
+    def test_add_after_truncate_keeps_existing_documents(self, temp_dir):
+        """Test that IDs assigned after a partial truncate never reuse stored IDs."""
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_documents.side_effect = (
+            lambda texts: np.ones((len(texts), 4), dtype=np.float32)
+        )
+        mock_embedding_model.embed_query.return_value = [1.0] * 4
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir),
+            collection_name="test",
+            embedding_model=mock_embedding_model,
+            backend="memory"
+        )
+
+        first_ids = store.add_documents(
+            [Document(page_content=f"Chunk {i}", metadata={}) for i in range(3)]
+        )
+        store.truncate(ids=first_ids[:1])
+        new_ids = store.add_documents([Document(page_content="Chunk 3", metadata={})])
+
+        assert not set(new_ids) & set(first_ids)
+        results = store.similarity_search("test query", k=10)
+        assert sorted(doc.page_content for doc, _ in results) == ["Chunk 1", "Chunk 2", "Chunk 3"]
+        assert store.get_collection_stats()["total_documents"] == 3
+
+    @patch('chromadb.PersistentClient')
+    def test_repeated_queries_delegate_to_embedding_model(self, mock_chroma_client, temp_dir):
+        """Test that the store leaves query embedding caching to the embedding model."""
+        mock_collection = Mock()
+        mock_collection.count.return_value = 1
+        mock_collection.query.return_value = {
+            'ids': [['doc1']],
+            'documents': [['Result']],
+            'metadatas': [[{'source': 'url1'}]],
+            'distances': [[0.1]]
+        }
+        mock_chroma_client.return_value.get_or_create_collection.return_value = mock_collection
+
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_query.return_value = [0.5] * 8
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir),
+            collection_name="test",
+            embedding_model=mock_embedding_model
+        )
+
+        store.similarity_search("test query", k=1)
+        store.similarity_search("test query", k=1)
+
+        assert mock_embedding_model.embed_query.call_count == 2
+        assert mock_collection.query.call_count == 2
+
+    @patch('chromadb.PersistentClient')
+    def test_similarity_search_with_score(self, mock_chroma_client, temp_dir, fake_vec_1536):
         """Test similarity search with relevance scores."""
         mock_collection = Mock()
         mock_collection.count.return_value = 1
@@ -125,7 +397,7 @@ class TestChromaVectorStore:
         mock_chroma_client.return_value = mock_client_instance
 
         mock_embedding_model = Mock()
-        mock_embedding_model.embed_query.return_value = [0.5] * 1536
+        mock_embedding_model.embed_query.return_value = fake_vec_1536
 
         store = ChromaVectorStore(
             persist_directory=str(temp_dir),
@@ -164,6 +436,36 @@ class TestChromaVectorStore:
         assert stats["collection_name"] == "test"
         assert stats["total_documents"] == 42
 
+    @patch('chromadb.PersistentClient')
+    def test_collection_count_is_cached(self, mock_chroma_client, temp_dir):
+        """Test that stats reuse the count taken at init and track adds/clears."""
+        mock_collection = Mock()
+        mock_collection.count.return_value = 42
+        mock_chroma_client.return_value.get_or_create_collection.return_value = mock_collection
+
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_documents.side_effect = (
+            lambda texts: [[0.1] * 8 for _ in texts]
+        )
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir),
+            collection_name="test",
+            embedding_model=mock_embedding_model
+        )
+
+        store.get_collection_stats()
+        store.get_collection_stats()
+        assert mock_collection.count.call_count == 1
+
+        ids = store.add_documents([Document(page_content="New chunk", metadata={})])
+        assert store.get_collection_stats()["total_documents"] == 43
+        assert mock_collection.add.call_args.kwargs["ids"] == ids
+
+        store.clear_collection()
+        assert store.get_collection_stats()["total_documents"] == 0
+        assert mock_collection.count.call_count == 1
+
     @patch('chromadb.PersistentClient')
     def test_clear_collection(self, mock_chroma_client, temp_dir):
         """Test clearing collection."""
@@ -187,8 +489,14 @@ class TestChromaVectorStore:
         mock_client_instance.delete_collection.assert_called_once_with(name="test")
         assert mock_client_instance.get_or_create_collection.call_count >= 2  # Initial + recreate
 
+        # Truncating a subset deletes rows in one call and keeps the collection
+        store.truncate(ids=["a", "b"])
+
+        mock_collection.delete.assert_called_once_with(ids=["a", "b"])
+        mock_client_instance.delete_collection.assert_called_once_with(name="test")
+
     @patch('chromadb.PersistentClient')
-    def test_add_documents_with_metadata(self, mock_chroma_client, temp_dir):
+    def test_add_documents_with_metadata(self, mock_chroma_client, temp_dir, fake_vec_1536):
         """Test that metadata is preserved when adding documents."""
         mock_collection = Mock()
         mock_collection.count.return_value = 0
@@ -197,7 +505,7 @@ class TestChromaVectorStore:
         mock_chroma_client.return_value = mock_client_instance
 
         mock_embedding_model = Mock()
-        mock_embedding_model.embed_documents.return_value = [[0.1] * 1536]
+        mock_embedding_model.embed_documents.return_value = [fake_vec_1536]
 
         store = ChromaVectorStore(
             persist_directory=str(temp_dir),
@@ -212,11 +520,51 @@ class TestChromaVectorStore:
 
         store.add_documents([doc])
 
-        # Verify add was called
+        # Verify add was called with the metadata and a contiguous float32 matrix
         assert mock_collection.add.called
+        add_kwargs = mock_collection.add.call_args.kwargs
+        assert add_kwargs["metadatas"] == [doc.metadata]
+        embeddings = add_kwargs["embeddings"]
+        assert isinstance(embeddings, np.ndarray)
+        assert embeddings.shape == (1, 1536)
+        assert embeddings.dtype == np.float32
+        assert embeddings.flags["C_CONTIGUOUS"]
+
+    def test_sanitize_metadata(self):
+        """Test that only None values are dropped and empty metadata becomes None."""
+        assert _sanitize_metadata(
+            {"source": "a.pdf", "page": None, "tags": ["x", "y"], "score": 0.5}
+        ) == {"source": "a.pdf", "tags": ["x", "y"], "score": 0.5}
+        assert _sanitize_metadata({"page": None}) is None
+        assert _sanitize_metadata({}) is None
+
+    def test_metadata_round_trip_with_real_collection(self, temp_dir):
+        """Test list values and all-None metadata against a real ChromaDB collection."""
+        mock_embedding_model = Mock()
+        mock_embedding_model.embed_documents.side_effect = (
+            lambda texts: np.eye(len(texts), 4, dtype=np.float32)
+        )
+        mock_embedding_model.embed_query.return_value = [1.0, 0.0, 0.0, 0.0]
+
+        store = ChromaVectorStore(
+            persist_directory=str(temp_dir),
+            collection_name="test",
+            embedding_model=mock_embedding_model
+        )
+
+        store.add_documents([
+            Document(page_content="Tagged", metadata={"tags": ["a", "b"], "page": None}),
+            Document(page_content="Untagged", metadata={"page": None}),
+        ])
+
+        results = store.similarity_search("test query", k=2)
+
+        assert [doc.page_content for doc, _ in results] == ["Tagged", "Untagged"]
+        assert [doc.metadata for doc, _ in results] == [{"tags": ["a", "b"]}, {}]
+        assert store.get_collection_stats()["total_documents"] == 2
 
     @patch('chromadb.PersistentClient')
-    def test_search_with_filter(self, mock_chroma_client, temp_dir):
+    def test_search_with_filter(self, mock_chroma_client, temp_dir, fake_vec_1536):
         """Test similarity search with metadata filter."""
         mock_collection = Mock()
         mock_collection.count.return_value = 1
@@ -232,7 +580,7 @@ class TestChromaVectorStore:
         mock_chroma_client.return_value = mock_client_instance
 
         mock_embedding_model = Mock()
-        mock_embedding_model.embed_query.return_value = [0.5] * 1536
+        mock_embedding_model.embed_query.return_value = fake_vec_1536
 
         store = ChromaVectorStore(
             persist_directory=str(temp_dir),
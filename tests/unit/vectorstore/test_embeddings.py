@@ -2,9 +2,63 @@
 Unit tests for embedding functionality.
 """
 
+import asyncio
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
 import pytest
-from unittest.mock import Mock
-from src.vectorstore.embeddings import OpenAIEmbedding
+from unittest.mock import AsyncMock, Mock, patch
+from src.vectorstore.embeddings import (
+    EMBEDDING_ENCODING_FORMAT,
+    OpenAIEmbedding,
+    _dequantize,
+    _quantize
+)
+
+
+class FakeEmbeddingsHandler(BaseHTTPRequestHandler):
+    """Answers POST /v1/embeddings with one base64 vector per input text."""
+
+    # Keep connections alive between requests, like the real API
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        payload = json.dumps({
+            "object": "list",
+            "model": body["model"],
+            "data": [
+                {"object": "embedding", "index": i, "embedding": b64_embedding(0.1, dim=8)}
+                for i in range(len(body["input"]))
+            ],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def embeddings_server():
+    """Local HTTP server speaking the embeddings API; yields its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeEmbeddingsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def b64_embedding(value, dim=1536):
+    """Encode a constant vector the way the API returns it with base64 encoding."""
+    return base64.b64encode(np.full(dim, value, dtype=np.float32).tobytes()).decode()
 
 
 @pytest.mark.unit
@@ -34,9 +88,9 @@ class TestOpenAIEmbedding:
         # Mock OpenAI response
         mock_response = Mock()
         mock_embedding1 = Mock()
-        mock_embedding1.embedding = [0.1] * 1536
+        mock_embedding1.embedding = b64_embedding(0.1)
         mock_embedding2 = Mock()
-        mock_embedding2.embedding = [0.2] * 1536
+        mock_embedding2.embedding = b64_embedding(0.2)
         mock_response.data = [mock_embedding1, mock_embedding2]
         mock_openai_client.embeddings.create.return_value = mock_response
 
@@ -46,17 +100,20 @@ class TestOpenAIEmbedding:
         texts = ["First document", "Second document"]
         embeddings = embedder.embed_documents(texts)
 
-        assert len(embeddings) == 2
-        assert len(embeddings[0]) == 1536
-        assert len(embeddings[1]) == 1536
-        assert embeddings[0][0] == 0.1
-        assert embeddings[1][0] == 0.2
+        assert embeddings.shape == (2, 1536)
+        assert embeddings.dtype == np.float32
+        assert embeddings[0][0] == pytest.approx(0.1)
+        assert embeddings[1][0] == pytest.approx(0.2)
+        assert (
+            mock_openai_client.embeddings.create.call_args.kwargs["encoding_format"]
+            == EMBEDDING_ENCODING_FORMAT
+        )
 
     def test_embed_query(self, mock_openai_client):
         """Test embedding a single query."""
         mock_response = Mock()
         mock_embedding = Mock()
-        mock_embedding.embedding = [0.5] * 1536
+        mock_embedding.embedding = b64_embedding(0.5)
         mock_response.data = [mock_embedding]
         mock_openai_client.embeddings.create.return_value = mock_response
 
@@ -65,8 +122,169 @@ class TestOpenAIEmbedding:
 
         query_embedding = embedder.embed_query("What is machine learning?")
 
-        assert len(query_embedding) == 1536
-        assert query_embedding[0] == 0.5
+        assert query_embedding.shape == (1536,)
+        assert query_embedding.dtype == np.float32
+        assert query_embedding[0] == pytest.approx(0.5)
+
+    def test_embed_query_is_cached(self, mock_openai_client, fake_vec_1536_list):
+        """Test that repeated queries are served from the embedding cache."""
+        mock_embedding = Mock()
+        mock_embedding.embedding = fake_vec_1536_list
+        mock_openai_client.embeddings.create.return_value = Mock(data=[mock_embedding])
+
+        embedder = OpenAIEmbedding(api_key="test-key")
+        embedder.client = mock_openai_client
+
+        first = embedder.embed_query("x")
+        second = embedder.embed_query("x")
+
+        np.testing.assert_array_equal(first, second)
+        assert mock_openai_client.embeddings.create.call_count == 1
+
+    def test_embed_documents_only_sends_uncached_texts(self, mock_openai_client):
+        """Test that embed_documents only requests texts missing from the cache."""
+        embedder = OpenAIEmbedding(api_key="test-key")
+        embedder.client = mock_openai_client
+
+        mock_openai_client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=[0.1] * 1536)]
+        )
+        embedder.embed_query("cached")
+
+        mock_openai_client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=[0.2] * 1536)]
+        )
+        embeddings = embedder.embed_documents(["new", "cached", "new"])
+
+        mock_openai_client.embeddings.create.assert_called_with(
+            input=["new"], model=embedder.model, encoding_format=EMBEDDING_ENCODING_FORMAT
+        )
+        assert embeddings[:, 0] == pytest.approx([0.2, 0.1, 0.2])
+
+    @pytest.mark.parametrize("cache_size,expected_slow_calls", [(0, 0), (1024, 1)])
+    def test_embed_documents_fast_path(
+        self, mock_openai_client, monkeypatch, cache_size, expected_slow_calls
+    ):
+        """Test that a single batch skips the caching path only when caching is off."""
+        mock_openai_client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=[0.1] * 1536), Mock(embedding=[0.2] * 1536)]
+        )
+
+        embedder = OpenAIEmbedding(api_key="test-key", cache_size=cache_size)
+        embedder.client = mock_openai_client
+
+        slow_path = Mock(wraps=embedder._embed_documents_cached)
+        monkeypatch.setattr(embedder, "_embed_documents_cached", slow_path)
+
+        embeddings = embedder.embed_documents(["First", "Second"])
+
+        assert slow_path.call_count == expected_slow_calls
+        assert embeddings.shape == (2, 1536)
+        assert embeddings.dtype == np.float32
+        assert embeddings[:, 0] == pytest.approx([0.1, 0.2])
+
+    def test_consecutive_embed_documents_calls_use_cache(self, mock_openai_client):
+        """Test that a second call with the default cache is served without a request."""
+        mock_openai_client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=[0.1] * 1536), Mock(embedding=[0.2] * 1536)]
+        )
+
+        embedder = OpenAIEmbedding(api_key="test-key")
+        embedder.client = mock_openai_client
+
+        first = embedder.embed_documents(["First", "Second"])
+        second = embedder.embed_documents(["Second", "First"])
+
+        assert mock_openai_client.embeddings.create.call_count == 1
+        np.testing.assert_array_equal(second, first[::-1])
+
+    def test_embedding_cache_evicts_least_recently_used(
+        self, mock_openai_client, fake_vec_1536_list
+    ):
+        """Test that the cache never grows beyond cache_size."""
+        mock_openai_client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=fake_vec_1536_list)]
+        )
+
+        embedder = OpenAIEmbedding(api_key="test-key", cache_size=2)
+        embedder.client = mock_openai_client
+
+        for text in ["a", "b", "c"]:
+            embedder.embed_query(text)
+        embedder.embed_query("a")
+
+        assert len(embedder._cache) == 2
+        assert mock_openai_client.embeddings.create.call_count == 4
+
+    def test_quantize_round_trip(self):
+        """Test that int8 quantization preserves the embedding direction."""
+        vector = np.random.default_rng(0).standard_normal(1536).astype(np.float32)
+
+        q, scale = _quantize(vector)
+        restored = _dequantize(q, scale)
+
+        cosine = restored @ vector / (np.linalg.norm(restored) * np.linalg.norm(vector))
+        assert q.dtype == np.int8
+        assert restored.dtype == np.float32
+        assert cosine > 0.999
+
+    def test_quantized_cache(self, mock_openai_client):
+        """Test that quantize_cache stores int8 entries and serves close vectors."""
+        values = np.random.default_rng(1).uniform(-0.1, 0.1, 1536).astype(np.float32)
+        mock_openai_client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=values.tolist())]
+        )
+
+        embedder = OpenAIEmbedding(api_key="test-key", quantize_cache=True)
+        embedder.client = mock_openai_client
+
+        first = embedder.embed_query("x")
+        second = embedder.embed_query("x")
+
+        q, _ = next(iter(embedder._cache.values()))
+        assert q.dtype == np.int8
+        assert mock_openai_client.embeddings.create.call_count == 1
+        assert second.dtype == np.float32
+        np.testing.assert_allclose(second, first, atol=0.001)
+
+    def test_persistent_cache_survives_restart(self, tmp_path):
+        """Test that a new embedder reuses embeddings stored in cache_path."""
+        cache_path = str(tmp_path / "cache.db")
+        first_client = Mock()
+        first_client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=[0.1] * 1536), Mock(embedding=[0.2] * 1536)]
+        )
+
+        with OpenAIEmbedding(api_key="test-key", cache_path=cache_path) as embedder:
+            embedder.client = first_client
+            expected = embedder.embed_documents(["first", "second"])
+
+        second_client = Mock()
+        with OpenAIEmbedding(api_key="test-key", cache_path=cache_path) as restarted:
+            restarted.client = second_client
+            statements = []
+            restarted._db.set_trace_callback(statements.append)
+
+            embeddings = restarted.embed_documents(["second", "first"])
+
+        second_client.embeddings.create.assert_not_called()
+        # Both texts are fetched from disk with a single query
+        assert len([sql for sql in statements if sql.startswith("SELECT")]) == 1
+        assert embeddings.dtype == np.float32
+        np.testing.assert_array_equal(embeddings, expected[::-1])
+
+    def test_close_releases_persistent_cache(self, tmp_path, mock_openai_client):
+        """Test that close() is idempotent and later calls skip the disk cache."""
+        mock_openai_client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=[0.1] * 1536)]
+        )
+        embedder = OpenAIEmbedding(api_key="test-key", cache_path=str(tmp_path / "cache.db"))
+        embedder.client = mock_openai_client
+
+        embedder.close()
+        embedder.close()
+
+        assert embedder.embed_query("after close")[0] == pytest.approx(0.1)
 
     def test_embed_empty_list(self, mock_openai_client):
         """Test embedding empty document list."""
@@ -75,9 +293,9 @@ class TestOpenAIEmbedding:
 
         embeddings = embedder.embed_documents([])
 
-        assert embeddings == []
+        assert len(embeddings) == 0
 
-    def test_cost_tracking_integration(self, mock_openai_client, temp_dir):
+    def test_cost_tracking_integration(self, mock_openai_client, temp_dir, fake_vec_1536_list):
         """Test that embeddings can work with cost tracker."""
         from src.utils.cost_tracker import CostTracker
 
@@ -86,7 +304,7 @@ class TestOpenAIEmbedding:
 
         mock_response = Mock()
         mock_embedding = Mock()
-        mock_embedding.embedding = [0.1] * 1536
+        mock_embedding.embedding = fake_vec_1536_list
         mock_response.data = [mock_embedding]
         mock_response.usage = Mock(total_tokens=100)
         mock_openai_client.embeddings.create.return_value = mock_response
@@ -125,8 +343,116 @@ class TestOpenAIEmbedding:
         texts = [f"Document {i}" for i in range(100)]
         embeddings = embedder.embed_documents(texts)
 
-        assert len(embeddings) == 100
-        assert all(len(emb) == 1536 for emb in embeddings)
+        assert embeddings.shape == (100, 1536)
+        assert mock_openai_client.embeddings.create.call_count == 1
+
+    def test_batch_processing_splits_at_2048(self, mock_openai_client):
+        """Test that more than 2048 inputs are split across requests."""
+        mock_openai_client.embeddings.create.side_effect = (
+            lambda input, model, encoding_format: Mock(
+                data=[Mock(embedding=[0.1] * 8) for _ in input]
+            )
+        )
+
+        embedder = OpenAIEmbedding(api_key="test-key")
+        embedder.client = mock_openai_client
+
+        texts = [f"Document {i}" for i in range(3000)]
+        embeddings = embedder.embed_documents(texts)
+
+        assert len(embeddings) == 3000
+        batch_sizes = sorted(
+            len(call.kwargs["input"])
+            for call in mock_openai_client.embeddings.create.call_args_list
+        )
+        assert batch_sizes == [952, 2048]
+
+    def test_embed_documents_runs_batches_concurrently(self, mock_openai_client, monkeypatch):
+        """Test that sync multi-batch requests overlap in the thread pool."""
+        monkeypatch.setattr('src.vectorstore.embeddings.MAX_BATCH_SIZE', 2)
+
+        # Each request waits until all four are in flight, so the call only
+        # completes if the batches are sent concurrently
+        barrier = threading.Barrier(4, timeout=5)
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def blocking_respond(input, model, encoding_format):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            barrier.wait()
+            with lock:
+                in_flight -= 1
+            return Mock(data=[Mock(embedding=[0.1] * 8) for _ in input])
+
+        mock_openai_client.embeddings.create.side_effect = blocking_respond
+        embedder = OpenAIEmbedding(api_key="test-key")
+        embedder.client = mock_openai_client
+
+        embeddings = embedder.embed_documents([f"Document {i}" for i in range(8)])
+
+        assert embeddings.shape == (8, 8)
+        assert mock_openai_client.embeddings.create.call_count == 4
+        assert peak == 4
+
+    def test_repeated_multi_batch_calls_with_real_clients(
+        self, monkeypatch, embeddings_server
+    ):
+        """Test that back-to-back multi-batch calls succeed over real HTTP clients."""
+        from openai import OpenAI
+
+        monkeypatch.setattr('src.vectorstore.embeddings.MAX_BATCH_SIZE', 2)
+
+        embedder = OpenAIEmbedding(api_key="test-key", cache_size=0)
+        embedder.client = OpenAI(api_key="test-key", base_url=embeddings_server)
+
+        for call in range(3):
+            embeddings = embedder.embed_documents([f"Call {call} doc {i}" for i in range(5)])
+
+            assert embeddings.shape == (5, 8)
+            assert embeddings[:, 0] == pytest.approx([0.1] * 5)
+
+    def test_aembed_documents_runs_batches_concurrently(self, monkeypatch):
+        """Test that multi-batch requests overlap instead of running serially."""
+        monkeypatch.setattr('src.vectorstore.embeddings.MAX_BATCH_SIZE', 2)
+
+        in_flight = peak = 0
+        all_in_flight = asyncio.Event()
+
+        async def blocking_respond(input, model, encoding_format):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            if in_flight == 4:
+                all_in_flight.set()
+            # Serial requests would never get the fourth one in flight
+            await asyncio.wait_for(all_in_flight.wait(), timeout=5)
+            in_flight -= 1
+            return Mock(data=[Mock(embedding=[0.1] * 8) for _ in input])
+
+        embedder = OpenAIEmbedding(api_key="test-key")
+        embedder.async_client = Mock()
+        embedder.async_client.embeddings.create = AsyncMock(side_effect=blocking_respond)
+
+        texts = [f"Document {i}" for i in range(8)]
+        embeddings = asyncio.run(embedder.aembed_documents(texts))
+
+        assert embeddings.shape == (8, 8)
+        assert embedder.async_client.embeddings.create.call_count == 4
+        assert peak == 4
+
+    def test_async_client_created_lazily(self):
+        """Test that the async client is only built when first needed."""
+        with patch("openai.AsyncOpenAI") as mock_async_openai:
+            embedder = OpenAIEmbedding(api_key="test-key")
+            mock_async_openai.assert_not_called()
+
+            client = embedder.async_client
+
+            assert embedder.async_client is client
+            mock_async_openai.assert_called_once_with(api_key="test-key")
 
     def test_model_variants(self):
         """Test different embedding model variants."""
@@ -144,11 +470,11 @@ class TestOpenAIEmbedding:
         )
         assert embedder_large.model == "text-embedding-3-large"
 
-    def test_embed_with_special_characters(self, mock_openai_client):
+    def test_embed_with_special_characters(self, mock_openai_client, fake_vec_1536_list):
         """Test embedding text with special characters."""
         mock_response = Mock()
         mock_embedding = Mock()
-        mock_embedding.embedding = [0.1] * 1536
+        mock_embedding.embedding = fake_vec_1536_list
         mock_response.data = [mock_embedding]
         mock_openai_client.embeddings.create.return_value = mock_response
 
@@ -158,7 +484,7 @@ class TestOpenAIEmbedding:
         text_with_special_chars = "Text with émojis 🚀 and symbols: €, ñ, 中文"
         embedding = embedder.embed_query(text_with_special_chars)
 
-        assert len(embedding) == 1536
+        assert embedding.shape == (1536,)
 
     def test_api_error_handling(self, mock_openai_client):
         """Test handling of API errors."""